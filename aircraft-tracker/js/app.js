@@ -483,9 +483,14 @@ function fetchSampleData() {
         } else {
             addAircraftMarker(aircraft);
         }
-        
-        // Save to database
-        saveAircraftToDatabase(aircraft);
+    });
+    
+    // Save to database: one request for the aircraft, then one for their positions
+    saveAircraftToDatabase(sampleAircraft).then(aircraftIds => {
+        const positions = sampleAircraft
+            .map(aircraft => buildPositionData(aircraftIds[aircraft.icao24], aircraft))
+            .filter(Boolean);
+        savePositionsToDatabase(positions);
     });
     
     // Hide loading
@@ -493,23 +498,25 @@ function fetchSampleData() {
 }
 
 /**
- * Save aircraft data to the database
- * @param {Object} aircraft - Aircraft data object
+ * Save a batch of aircraft to the database
+ * @param {Array<Object>} aircraftList - Aircraft data objects
+ * @returns {Promise<Object>} Database IDs keyed by ICAO24 address (empty if the save failed)
  */
-function saveAircraftToDatabase(aircraft) {
-    // Check if we have the required data
-    if (!aircraft || !aircraft.icao24) return;
-    
-    // Prepare data for the API
-    const data = {
-        icao24: aircraft.icao24,
-        callsign: aircraft.callsign,
-        aircraft_type: estimateAircraftType(aircraft.icao24, aircraft.callsign),
-        origin_country: aircraft.origin_country
-    };
+function saveAircraftToDatabase(aircraftList) {
+    // Prepare data for the API, skipping aircraft without an address
+    const data = aircraftList
+        .filter(aircraft => aircraft && aircraft.icao24)
+        .map(aircraft => ({
+            icao24: aircraft.icao24,
+            callsign: aircraft.callsign,
+            aircraft_type: estimateAircraftType(aircraft.icao24, aircraft.callsign),
+            origin_country: aircraft.origin_country
+        }));
     
-    // Make API call to save aircraft
-    fetch('http://localhost:5001/api/aircraft', {
+    if (!data.length) return Promise.resolve({});
+    
+    // Make a single API call for the whole batch
+    return fetch('http://localhost:5001/api/aircraft/bulk', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
@@ -519,32 +526,29 @@ function saveAircraftToDatabase(aircraft) {
     .then(response => response.json())
     .then(result => {
         if (result.success) {
-            console.log(`Aircraft ${aircraft.icao24} saved with ID: ${result.aircraft_id}`);
-            
-            // Save position if we have it
-            if (aircraft.latitude && aircraft.longitude) {
-                savePositionToDatabase(result.aircraft_id, aircraft);
-            }
-        } else {
-            console.error(`Error saving aircraft: ${result.error}`);
+            console.log(`Saved ${Object.keys(result.aircraft_ids).length} aircraft`);
+            return result.aircraft_ids;
         }
+        console.error(`Error saving aircraft: ${result.error}`);
+        return {};
     })
     .catch(error => {
         console.error('API error saving aircraft:', error);
+        return {};
     });
 }
 
 /**
- * Save aircraft position to the database
+ * Build the position record for an aircraft
  * @param {number} aircraft_id - Database ID of the aircraft
  * @param {Object} aircraft - Aircraft data with position
+ * @returns {Object|null} Position data for the API, or null if the aircraft has no position
  */
-function savePositionToDatabase(aircraft_id, aircraft) {
-    // Check if we have position data
-    if (!aircraft || !aircraft.latitude || !aircraft.longitude) return;
+function buildPositionData(aircraft_id, aircraft) {
+    // Check if the aircraft was saved and we have position data
+    if (!aircraft_id || !aircraft || !aircraft.latitude || !aircraft.longitude) return null;
     
-    // Prepare position data
-    const positionData = {
+    return {
         aircraft_id: aircraft_id,
         latitude: aircraft.latitude,
         longitude: aircraft.longitude,
@@ -554,25 +558,33 @@ function savePositionToDatabase(aircraft_id, aircraft) {
         vertical_speed: aircraft.vertical_rate,
         on_ground: aircraft.on_ground || false
     };
+}
+
+/**
+ * Save a batch of aircraft positions to the database
+ * @param {Array<Object>} positions - Position records from buildPositionData
+ */
+function savePositionsToDatabase(positions) {
+    if (!positions.length) return;
     
-    // Make API call to save position
-    fetch('http://localhost:5001/api/positions', {
+    // Make a single API call for the whole batch
+    fetch('http://localhost:5001/api/positions/bulk', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
         },
-        body: JSON.stringify(positionData)
+        body: JSON.stringify(positions)
     })
     .then(response => response.json())
     .then(result => {
         if (result.success) {
-            console.log(`Position saved for aircraft ${aircraft_id}, position ID: ${result.position_id}`);
+            console.log(`Saved ${result.stored} aircraft positions`);
         } else {
-            console.error(`Error saving position: ${result.error}`);
+            console.error(`Error saving positions: ${result.error}`);
         }
     })
     .catch(error => {
-        console.error('API error saving position:', error);
+        console.error('API error saving positions:', error);
     });
 }
 
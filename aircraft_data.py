@@ -1,5 +1,11 @@
 # Aircraft specifications database
 
+import re
+import sys
+from enum import IntEnum
+from functools import lru_cache
+from types import MappingProxyType
+
 # Dictionary of aircraft types with their key performance characteristics
 # - glide_ratio: How far an aircraft can glide horizontally for each unit of altitude loss
 # - max_range: Maximum flying range in nautical miles
@@ -65,10 +71,42 @@ aircraft_types = {
     }
 }
 
+# Freeze the table with interned keys so lookups can short-circuit on identity
+aircraft_types = MappingProxyType({sys.intern(name): specs for name, specs in aircraft_types.items()})
+
+# Aircraft type names in display order, built once for the UI selectbox
+AIRCRAFT_TYPE_NAMES = tuple(aircraft_types)
+
+def _member_name(name):
+    """AircraftType member name for a type name: its model in parentheses, e.g. CESSNA_172"""
+    model = name[name.rindex('(') + 1:name.rindex(')')]
+    return re.sub(r'\W+', '_', model).upper()
+
+# Integer IDs for the aircraft types, generated from AIRCRAFT_TYPE_NAMES so each
+# ID always matches its entry's position in the table
+AircraftType = IntEnum(
+    'AircraftType',
+    {_member_name(name): i for i, name in enumerate(AIRCRAFT_TYPE_NAMES)},
+    module=__name__
+)
+
+# Name to ID lookup; internal lookups index by ID instead of hashing the long names
+_IDX = {name: AircraftType(i) for i, name in enumerate(AIRCRAFT_TYPE_NAMES)}
+
+# Fallback used when an unknown aircraft type is requested
+_DEFAULT_IDX = AircraftType.CESSNA_172
+
+# Read-only specs indexed by AircraftType
+_SPECS_BY_ID = tuple(MappingProxyType(aircraft_types[name]) for name in AIRCRAFT_TYPE_NAMES)
+
+@lru_cache(maxsize=None)
 def get_aircraft_specs(aircraft_type):
     """
     Returns the specifications for a given aircraft type.
     
+    Results are cached and shared between callers, so they are returned
+    as read-only mappings.
+    
     Parameters:
     -----------
     aircraft_type : str
@@ -76,7 +114,7 @@ def get_aircraft_specs(aircraft_type):
         
     Returns:
     --------
-    dict
-        A dictionary containing the specifications for the requested aircraft type
+    MappingProxyType
+        A read-only mapping containing the specifications for the requested aircraft type
     """
-    return aircraft_types.get(aircraft_type, aircraft_types["Small Single-Engine (Cessna 172)"])
+    return _SPECS_BY_ID[_IDX.get(aircraft_type, _DEFAULT_IDX)]
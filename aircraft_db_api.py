@@ -2,128 +2,263 @@
 API for connecting the frontend to the database
 """
 
-import json
-from flask import Flask, request, jsonify
+import os
+
+# Under gunicorn's gevent worker (GEVENT_MONKEY=1), make psycopg2 cooperative
+# so requests waiting on the database yield to other requests
+if os.environ.get('GEVENT_MONKEY'):
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+
+import msgspec
+import orjson
+from flask import Flask, Response, request, stream_with_context
 from flask_cors import CORS
+from flask_compress import Compress
 from db_utils import (
-    create_or_update_aircraft, store_aircraft_position, 
-    store_search_query, store_search_result, store_emergency_prediction,
-    get_recent_aircraft, get_aircraft_positions, get_search_history,
-    get_prediction_history, find_aircraft_by_callsign,
-    find_aircraft_by_icao24, find_aircraft_by_country,
+    create_or_update_aircraft, upsert_aircraft_bulk,
+    store_aircraft_position, store_aircraft_positions_bulk,
+    log_search,
+    store_emergency_prediction, store_emergency_predictions_bulk,
+    get_recent_aircraft_rows, get_aircraft_position_rows, get_search_history_rows,
+    get_prediction_history_rows, find_aircraft_rows_by_callsign,
+    find_aircraft_rows_by_icao24, find_aircraft_rows_by_country,
     get_aircraft_by_id
 )
 
 app = Flask(__name__)
 CORS(app)
 
+# Compress JSON responses with the first encoding the client accepts, in the
+# order below; list endpoints compress well. Set explicitly rather than relying
+# on flask-compress defaults, which have changed between releases
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_ALGORITHM'] = ['zstd', 'br', 'gzip', 'deflate']
+# Streamed listings are compressed too; flask-compress cannot gzip a stream
+app.config['COMPRESS_STREAMS'] = True
+app.config['COMPRESS_ALGORITHM_STREAMING'] = ['zstd', 'br', 'deflate']
+Compress(app)
+
+# Request body schemas; decoding validates types and rejects unknown fields in one pass
+class AircraftRequest(msgspec.Struct, forbid_unknown_fields=True):
+    icao24: str
+    callsign: str | None = None
+    aircraft_type: str | None = None
+    origin_country: str | None = None
+
+class PositionRequest(msgspec.Struct, forbid_unknown_fields=True):
+    aircraft_id: int
+    latitude: float
+    longitude: float
+    altitude: float | None = None
+    ground_speed: float | None = None
+    heading: float | None = None
+    vertical_speed: float | None = None
+    on_ground: bool | None = False
+
+class SearchRequest(msgspec.Struct, forbid_unknown_fields=True):
+    search_type: str
+    search_value: str
+    aircraft_ids: list[int] | None = None
+
+class PredictionRequest(msgspec.Struct, forbid_unknown_fields=True):
+    aircraft_id: int
+    current_position: dict
+    aircraft_params: dict
+    wind_conditions: dict
+    aircraft_type: str
+    glide_ratio: float
+    prediction_results: dict
+
+def _decode_body(schema):
+    """Decode the raw request body straight into a request struct"""
+    return msgspec.json.decode(request.get_data(), type=schema)
+
+def _fast_jsonify(payload, status=200):
+    """Serialize a response payload with orjson, which encodes datetimes natively"""
+    body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return Response(body, status=status, mimetype='application/json')
+
+def _stream_jsonify(key, rows):
+    """
+    Stream {"success": true, key: [...]} one encoded row at a time, so large
+    listings are never held in memory as a whole
+    """
+    rows = iter(rows)
+    # Pull the first row eagerly so query errors surface before the response starts
+    first = next(rows, None)
+    
+    def generate():
+        yield b'{"success":true,"' + key.encode() + b'":['
+        if first is not None:
+            yield orjson.dumps(first, option=orjson.OPT_SERIALIZE_NUMPY)
+            for row in rows:
+                yield b',' + orjson.dumps(row, option=orjson.OPT_SERIALIZE_NUMPY)
+        yield b']}'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+@app.errorhandler(msgspec.DecodeError)
+def invalid_request_body(e):
+    """Reject malformed or mistyped request bodies before they reach the database"""
+    return _fast_jsonify({
+        'success': False,
+        'error': str(e)
+    }, 400)
+
 @app.route('/api/aircraft', methods=['POST'])
 def add_update_aircraft():
     """API endpoint to add or update aircraft"""
-    data = request.json
+    data = _decode_body(AircraftRequest)
     
     try:
         aircraft_data = create_or_update_aircraft(
-            icao24=data['icao24'],
-            callsign=data.get('callsign'),
-            aircraft_type=data.get('aircraft_type'),
-            origin_country=data.get('origin_country')
+            icao24=data.icao24,
+            callsign=data.callsign,
+            aircraft_type=data.aircraft_type,
+            origin_country=data.origin_country
         )
         
-        return jsonify({
+        return _fast_jsonify({
             'success': True,
             'aircraft_id': aircraft_data['id']
         })
     except Exception as e:
-        return jsonify({
+        return _fast_jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
+
+@app.route('/api/aircraft/bulk', methods=['POST'])
+def add_update_aircraft_bulk():
+    """API endpoint to add or update a batch of aircraft"""
+    data = _decode_body(list[AircraftRequest])
+    
+    try:
+        aircraft_ids = upsert_aircraft_bulk([msgspec.structs.asdict(a) for a in data])
+        
+        return _fast_jsonify({
+            'success': True,
+            'aircraft_ids': aircraft_ids
+        })
+    except Exception as e:
+        return _fast_jsonify({
+            'success': False,
+            'error': str(e)
+        }, 500)
 
 @app.route('/api/positions', methods=['POST'])
 def add_position():
     """API endpoint to add aircraft position"""
-    data = request.json
+    data = _decode_body(PositionRequest)
     
     try:
         position = store_aircraft_position(
-            aircraft_id=data['aircraft_id'],
-            latitude=data['latitude'],
-            longitude=data['longitude'],
-            altitude=data.get('altitude'),
-            ground_speed=data.get('ground_speed'),
-            heading=data.get('heading'),
-            vertical_speed=data.get('vertical_speed'),
-            on_ground=data.get('on_ground', False)
+            aircraft_id=data.aircraft_id,
+            latitude=data.latitude,
+            longitude=data.longitude,
+            altitude=data.altitude,
+            ground_speed=data.ground_speed,
+            heading=data.heading,
+            vertical_speed=data.vertical_speed,
+            on_ground=data.on_ground
         )
         
-        return jsonify({
+        return _fast_jsonify({
             'success': True,
             'position_id': position.id
         })
     except Exception as e:
-        return jsonify({
+        return _fast_jsonify({
+            'success': False,
+            'error': str(e)
+        }, 500)
+
+@app.route('/api/positions/bulk', methods=['POST'])
+def add_positions_bulk():
+    """API endpoint to add a batch of aircraft positions"""
+    data = _decode_body(list[PositionRequest])
+    
+    try:
+        stored = store_aircraft_positions_bulk([msgspec.structs.asdict(p) for p in data])
+        
+        return _fast_jsonify({
+            'success': True,
+            'stored': stored
+        })
+    except Exception as e:
+        return _fast_jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/search', methods=['POST'])
 def search():
     """API endpoint to record a search"""
-    data = request.json
+    data = _decode_body(SearchRequest)
     
     try:
-        query = store_search_query(
-            search_type=data['search_type'],
-            search_value=data['search_value']
+        # The query and its results are stored in one transaction
+        query_id, result_ids = log_search(
+            search_type=data.search_type,
+            search_value=data.search_value,
+            aircraft_ids=data.aircraft_ids
         )
         
-        # Store results if provided
-        results = []
-        if 'aircraft_ids' in data:
-            for aircraft_id in data['aircraft_ids']:
-                result = store_search_result(
-                    query_id=query.id,
-                    aircraft_id=aircraft_id
-                )
-                results.append(result.id)
-        
-        return jsonify({
+        return _fast_jsonify({
             'success': True,
-            'query_id': query.id,
-            'result_ids': results
+            'query_id': query_id,
+            'result_ids': result_ids
         })
     except Exception as e:
-        return jsonify({
+        return _fast_jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/predictions', methods=['POST'])
 def add_prediction():
     """API endpoint to add emergency prediction"""
-    data = request.json
+    data = _decode_body(PredictionRequest)
     
     try:
         prediction = store_emergency_prediction(
-            aircraft_id=data['aircraft_id'],
-            current_position=data['current_position'],
-            aircraft_params=data['aircraft_params'],
-            wind_conditions=data['wind_conditions'],
-            aircraft_type=data['aircraft_type'],
-            glide_ratio=data['glide_ratio'],
-            prediction_results=data['prediction_results']
+            aircraft_id=data.aircraft_id,
+            current_position=data.current_position,
+            aircraft_params=data.aircraft_params,
+            wind_conditions=data.wind_conditions,
+            aircraft_type=data.aircraft_type,
+            glide_ratio=data.glide_ratio,
+            prediction_results=data.prediction_results
         )
         
-        return jsonify({
+        return _fast_jsonify({
             'success': True,
             'prediction_id': prediction.id
         })
     except Exception as e:
-        return jsonify({
+        return _fast_jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
+
+@app.route('/api/predictions/bulk', methods=['POST'])
+def add_predictions_bulk():
+    """API endpoint to add a batch of emergency predictions"""
+    data = _decode_body(list[PredictionRequest])
+    
+    try:
+        prediction_ids = store_emergency_predictions_bulk([msgspec.structs.asdict(p) for p in data])
+        
+        return _fast_jsonify({
+            'success': True,
+            'prediction_ids': prediction_ids
+        })
+    except Exception as e:
+        return _fast_jsonify({
+            'success': False,
+            'error': str(e)
+        }, 500)
 
 @app.route('/api/aircraft/recent', methods=['GET'])
 def recent_aircraft():
@@ -131,24 +266,14 @@ def recent_aircraft():
     limit = request.args.get('limit', 100, type=int)
     
     try:
-        aircraft_list = get_recent_aircraft(limit=limit)
+        rows = get_recent_aircraft_rows(limit=limit)
         
-        return jsonify({
-            'success': True,
-            'aircraft': [{
-                'id': a.id,
-                'icao24': a.icao24,
-                'callsign': a.callsign,
-                'aircraft_type': a.aircraft_type,
-                'origin_country': a.origin_country,
-                'last_updated': a.last_updated.isoformat() if a.last_updated else None
-            } for a in aircraft_list]
-        })
+        return _stream_jsonify('aircraft', rows)
     except Exception as e:
-        return jsonify({
+        return _fast_jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/aircraft/<int:aircraft_id>/positions', methods=['GET'])
 def aircraft_positions(aircraft_id):
@@ -156,27 +281,14 @@ def aircraft_positions(aircraft_id):
     limit = request.args.get('limit', 10, type=int)
     
     try:
-        positions = get_aircraft_positions(aircraft_id=aircraft_id, limit=limit)
+        rows = get_aircraft_position_rows(aircraft_id=aircraft_id, limit=limit)
         
-        return jsonify({
-            'success': True,
-            'positions': [{
-                'id': p.id,
-                'timestamp': p.timestamp.isoformat() if p.timestamp else None,
-                'latitude': p.latitude,
-                'longitude': p.longitude,
-                'altitude': p.altitude,
-                'ground_speed': p.ground_speed,
-                'heading': p.heading,
-                'vertical_speed': p.vertical_speed,
-                'on_ground': p.on_ground
-            } for p in positions]
-        })
+        return _stream_jsonify('positions', rows)
     except Exception as e:
-        return jsonify({
+        return _fast_jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/search/history', methods=['GET'])
 def search_history():
@@ -184,22 +296,14 @@ def search_history():
     limit = request.args.get('limit', 10, type=int)
     
     try:
-        queries = get_search_history(limit=limit)
+        rows = get_search_history_rows(limit=limit)
         
-        return jsonify({
-            'success': True,
-            'searches': [{
-                'id': q.id,
-                'search_type': q.search_type,
-                'search_value': q.search_value,
-                'timestamp': q.timestamp.isoformat() if q.timestamp else None
-            } for q in queries]
-        })
+        return _stream_jsonify('searches', rows)
     except Exception as e:
-        return jsonify({
+        return _fast_jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/predictions/history', methods=['GET'])
 def prediction_history():
@@ -207,101 +311,71 @@ def prediction_history():
     limit = request.args.get('limit', 10, type=int)
     
     try:
-        predictions = get_prediction_history(limit=limit)
+        rows = get_prediction_history_rows(limit=limit)
         
-        return jsonify({
-            'success': True,
-            'predictions': [{
-                'id': p.id,
-                'aircraft_id': p.aircraft_id,
-                'timestamp': p.timestamp.isoformat() if p.timestamp else None,
-                'latitude': p.latitude,
-                'longitude': p.longitude,
-                'altitude': p.altitude,
-                'predicted_landing_latitude': p.predicted_landing_latitude,
-                'predicted_landing_longitude': p.predicted_landing_longitude,
-                'glide_distance': p.glide_distance,
-                'glide_time': p.glide_time,
-                'aircraft_type': p.aircraft_type
-            } for p in predictions]
-        })
+        return _stream_jsonify('predictions', rows)
     except Exception as e:
-        return jsonify({
+        return _fast_jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/aircraft/search/callsign/<callsign>', methods=['GET'])
 def search_by_callsign(callsign):
     """API endpoint to search aircraft by callsign"""
     try:
-        aircraft_list = find_aircraft_by_callsign(callsign)
+        rows = find_aircraft_rows_by_callsign(callsign)
         
-        return jsonify({
+        return _fast_jsonify({
             'success': True,
-            'aircraft': [{
-                'id': a.id,
-                'icao24': a.icao24,
-                'callsign': a.callsign,
-                'aircraft_type': a.aircraft_type,
-                'origin_country': a.origin_country,
-                'last_updated': a.last_updated.isoformat() if a.last_updated else None
-            } for a in aircraft_list]
+            'aircraft': rows
         })
     except Exception as e:
-        return jsonify({
+        return _fast_jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/aircraft/search/icao24/<icao24>', methods=['GET'])
 def search_by_icao24(icao24):
     """API endpoint to search aircraft by ICAO24 address"""
     try:
-        aircraft_list = find_aircraft_by_icao24(icao24)
+        rows = find_aircraft_rows_by_icao24(icao24)
         
-        return jsonify({
+        return _fast_jsonify({
             'success': True,
-            'aircraft': [{
-                'id': a.id,
-                'icao24': a.icao24,
-                'callsign': a.callsign,
-                'aircraft_type': a.aircraft_type,
-                'origin_country': a.origin_country,
-                'last_updated': a.last_updated.isoformat() if a.last_updated else None
-            } for a in aircraft_list]
+            'aircraft': rows
         })
     except Exception as e:
-        return jsonify({
+        return _fast_jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/aircraft/search/country/<country>', methods=['GET'])
 def search_by_country(country):
     """API endpoint to search aircraft by origin country"""
     try:
-        aircraft_list = find_aircraft_by_country(country)
+        rows = find_aircraft_rows_by_country(country)
         
-        return jsonify({
+        return _fast_jsonify({
             'success': True,
-            'aircraft': [{
-                'id': a.id,
-                'icao24': a.icao24,
-                'callsign': a.callsign,
-                'aircraft_type': a.aircraft_type,
-                'origin_country': a.origin_country,
-                'last_updated': a.last_updated.isoformat() if a.last_updated else None
-            } for a in aircraft_list]
+            'aircraft': rows
         })
     except Exception as e:
-        return jsonify({
+        return _fast_jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 def run_api_server(host='0.0.0.0', port=5001, debug=False):
-    """Run the API server"""
+    """
+    Run the API server with Flask's development server.
+    
+    The development server is meant for local use, not production. To
+    deploy, serve the app with gunicorn's gevent workers instead:
+    GEVENT_MONKEY=1 gunicorn -k gevent -w 4 --bind 0.0.0.0:5001 aircraft_db_api:app
+    """
     app.run(host=host, port=port, debug=debug)
 
 if __name__ == '__main__':
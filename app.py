@@ -1,21 +1,19 @@
 import streamlit as st
-import folium
-from folium.plugins import HeatMap
-from streamlit_folium import folium_static
-import pandas as pd
-import numpy as np
-import csv
-import io
-from datetime import datetime
 import streamlit.components.v1 as components
 import os
-from serve_frontend import serve_tracker_frontend
+from serve_frontend import serve_tracker_frontend, load_html_interface
 
-from aircraft_data import aircraft_types, get_aircraft_specs
-from search_algorithm import calculate_search_area, calculate_probability_distribution
-from map_visualization import create_map, add_last_position_marker, add_probability_heatmap, add_search_radius
-from utils import haversine_distance, calculate_bearing, export_search_coordinates
-from database_view import show_database_view
+# The map, search and database modules are imported inside the branches that
+# use them, so the HTML interfaces don't pay for loading folium, numpy and pandas
+
+@st.cache_resource
+def load_aircraft_catalog():
+    """
+    Load the aircraft type names and specs lookup once per process so reruns
+    reuse the same frozen objects instead of touching the module again.
+    """
+    from aircraft_data import AIRCRAFT_TYPE_NAMES, get_aircraft_specs
+    return AIRCRAFT_TYPE_NAMES, get_aircraft_specs
 
 # Set page configuration
 st.set_page_config(
@@ -56,12 +54,8 @@ if interface_option == "HTML/JavaScript Version":
     
     # Load and display the HTML interface
     try:
-        with open('static/index.html', 'r') as f:
-            html_content = f.read()
-            
-        # Inject base path for resources
-        html_content = html_content.replace('src="js/', 'src="static/js/')
-        html_content = html_content.replace('href="css/', 'href="static/css/')
+        html_path = 'static/index.html'
+        html_content = load_html_interface(html_path, os.path.getmtime(html_path))
             
         # Display the HTML content in an iframe
         components.html(html_content, height=900, scrolling=True)
@@ -90,12 +84,8 @@ elif interface_option == "Aircraft Tracker (Real-time)":
     
     # Load and display the aircraft tracker interface
     try:
-        with open('aircraft-tracker/index.html', 'r') as f:
-            html_content = f.read()
-            
-        # Inject base path for resources to ensure they load correctly in Streamlit
-        html_content = html_content.replace('src="js/', 'src="aircraft-tracker/js/')
-        html_content = html_content.replace('href="css/', 'href="aircraft-tracker/css/')
+        html_path = 'aircraft-tracker/index.html'
+        html_content = load_html_interface(html_path, os.path.getmtime(html_path))
             
         # Display the HTML content in an iframe
         components.html(html_content, height=900, scrolling=True)
@@ -104,10 +94,22 @@ elif interface_option == "Aircraft Tracker (Real-time)":
         st.info("Please make sure the aircraft-tracker/index.html file exists.")
 
 elif interface_option == "Database Records":
+    from database_view import show_database_view
+    
     # Show the database view interface
     show_database_view()
         
 else:
+    from datetime import datetime
+    import numpy as np
+    from streamlit_folium import folium_static
+    
+    from search_algorithm import calculate_search_area, calculate_probability_distribution
+    from map_visualization import create_map, add_last_position_marker, add_probability_heatmap, add_search_radius
+    from utils import export_search_coordinates
+    
+    AIRCRAFT_TYPE_NAMES, get_aircraft_specs = load_aircraft_catalog()
+    
     # Original Streamlit Interface
     # Title and description
     st.title("Aircraft Search Location Calculator")
@@ -123,7 +125,7 @@ else:
     # Aircraft type
     aircraft_type = st.sidebar.selectbox(
         "Aircraft Type",
-        options=list(aircraft_types.keys()),
+        options=AIRCRAFT_TYPE_NAMES,
         help="Select the type of aircraft that is missing"
     )
 
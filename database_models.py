@@ -3,10 +3,11 @@ Database models for the Aircraft Search Prediction System
 """
 
 import os
+import atexit
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, JSON
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy import create_engine, inspect, text, CheckConstraint, Float, String, ForeignKey, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB, REAL
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker, scoped_session, relationship
 
 # Get database URL from environment variables
 DATABASE_URL = os.environ.get('DATABASE_URL', '')
@@ -17,11 +18,30 @@ if not DATABASE_URL:
     DATABASE_URL = 'sqlite:///aircraft_tracker.db'
     print("Warning: No DATABASE_URL environment variable found. Using SQLite database.")
 
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+# Create SQLAlchemy engine with a connection pool sized for concurrent API requests;
+# pre-ping and recycling drop connections the server has closed in long-lived processes
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=20,
+    max_overflow=40,
+    pool_pre_ping=True,
+    # Reuse the most recently returned connection so idle extras can time out
+    pool_use_lifo=True,
+    pool_recycle=1800,
+    # Rows per multi-VALUES statement when bulk inserts are batched
+    insertmanyvalues_page_size=500
+)
 
-# Create declarative base
-Base = declarative_base()
+# Close pooled connections cleanly when the process exits
+atexit.register(engine.dispose)
+
+# Declarative base for all models
+class Base(DeclarativeBase):
+    pass
+
+# Relationship loading is chosen per relationship: many-to-one links load on
+# access, while one-to-many collections that nothing reads raise instead of
+# silently issuing a query for what may be thousands of rows
 
 class Aircraft(Base):
     """
@@ -29,16 +49,36 @@ class Aircraft(Base):
     """
     __tablename__ = 'aircraft'
     
-    id = Column(Integer, primary_key=True)
-    icao24 = Column(String(24), nullable=False, unique=True, index=True)
-    callsign = Column(String(10))
-    aircraft_type = Column(String(50))
-    origin_country = Column(String(100))
-    last_updated = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    icao24: Mapped[str] = mapped_column(String(24), unique=True, index=True)
+    callsign: Mapped[str | None] = mapped_column(String(10), index=True)
+    aircraft_type: Mapped[str | None] = mapped_column(String(50))
+    origin_country: Mapped[str | None] = mapped_column(String(100), index=True)
+    last_updated: Mapped[datetime | None] = mapped_column(default=datetime.utcnow)
+    
+    # Recent-aircraft listings sort newest first; on PostgreSQL, trigram
+    # indexes let the substring (ILIKE '%...%') searches avoid a table scan
+    __table_args__ = (
+        Index('ix_aircraft_last_updated', last_updated.desc()),
+        Index(
+            'ix_aircraft_callsign_trgm', callsign,
+            postgresql_using='gin', postgresql_ops={'callsign': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'ix_aircraft_icao24_trgm', icao24,
+            postgresql_using='gin', postgresql_ops={'icao24': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'ix_aircraft_origin_country_trgm', origin_country,
+            postgresql_using='gin', postgresql_ops={'origin_country': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
     
     # Relationships
-    positions = relationship("AircraftPosition", back_populates="aircraft", cascade="all, delete-orphan")
-    search_results = relationship("SearchResult", back_populates="aircraft")
+    positions: Mapped[list["AircraftPosition"]] = relationship(
+        back_populates="aircraft", cascade="all, delete-orphan", lazy="raise"
+    )
+    search_results: Mapped[list["SearchResult"]] = relationship(back_populates="aircraft", lazy="raise")
     
     def __repr__(self):
         return f"<Aircraft(icao24='{self.icao24}', callsign='{self.callsign}')>"
@@ -49,21 +89,37 @@ class AircraftPosition(Base):
     """
     __tablename__ = 'aircraft_positions'
     
-    id = Column(Integer, primary_key=True)
-    aircraft_id = Column(Integer, ForeignKey('aircraft.id'), nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    aircraft_id: Mapped[int] = mapped_column(ForeignKey('aircraft.id'))
+    timestamp: Mapped[datetime | None] = mapped_column(default=datetime.utcnow, index=True)
     
-    # Position data
-    latitude = Column(Float, nullable=False)
-    longitude = Column(Float, nullable=False)
-    altitude = Column(Float)  # in feet
-    ground_speed = Column(Float)  # in knots
-    heading = Column(Float)  # in degrees
-    vertical_speed = Column(Float)  # in feet per minute
-    on_ground = Column(Boolean, default=False)
+    # Position data; coordinates keep double precision, while the flight values
+    # are single precision (real on PostgreSQL) to keep this high-volume table small
+    latitude: Mapped[float]
+    longitude: Mapped[float]
+    altitude: Mapped[float | None] = mapped_column(Float(precision=24))  # in feet
+    ground_speed: Mapped[float | None] = mapped_column(Float(precision=24))  # in knots
+    heading: Mapped[float | None] = mapped_column(Float(precision=24))  # in degrees
+    vertical_speed: Mapped[float | None] = mapped_column(Float(precision=24))  # in feet per minute
+    on_ground: Mapped[bool | None] = mapped_column(default=False)
+    
+    # Position lookups filter by aircraft and read the newest rows first; on
+    # PostgreSQL the projected columns ride along in the index so the query
+    # is answered by an index-only scan without touching the table
+    __table_args__ = (
+        CheckConstraint('latitude BETWEEN -90 AND 90', name='ck_position_latitude'),
+        CheckConstraint('longitude BETWEEN -180 AND 180', name='ck_position_longitude'),
+        Index(
+            'ix_pos_cover', aircraft_id, timestamp.desc(),
+            postgresql_include=[
+                'id', 'latitude', 'longitude', 'altitude', 'ground_speed',
+                'heading', 'vertical_speed', 'on_ground'
+            ]
+        ),
+    )
     
     # Relationship
-    aircraft = relationship("Aircraft", back_populates="positions")
+    aircraft: Mapped["Aircraft"] = relationship(back_populates="positions", lazy="select")
     
     def __repr__(self):
         return f"<AircraftPosition(icao24='{self.aircraft.icao24}', time='{self.timestamp}')>"
@@ -74,13 +130,15 @@ class SearchQuery(Base):
     """
     __tablename__ = 'search_queries'
     
-    id = Column(Integer, primary_key=True)
-    search_type = Column(String(50), nullable=False)  # callsign, icao24, country
-    search_value = Column(String(100), nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    search_type: Mapped[str] = mapped_column(String(50), index=True)  # callsign, icao24, country
+    search_value: Mapped[str] = mapped_column(String(100))
+    timestamp: Mapped[datetime | None] = mapped_column(default=datetime.utcnow, index=True)
     
     # Relationships
-    results = relationship("SearchResult", back_populates="query", cascade="all, delete-orphan")
+    results: Mapped[list["SearchResult"]] = relationship(
+        back_populates="query", cascade="all, delete-orphan", lazy="raise"
+    )
     
     def __repr__(self):
         return f"<SearchQuery(type='{self.search_type}', value='{self.search_value}')>"
@@ -91,14 +149,14 @@ class SearchResult(Base):
     """
     __tablename__ = 'search_results'
     
-    id = Column(Integer, primary_key=True)
-    query_id = Column(Integer, ForeignKey('search_queries.id'), nullable=False)
-    aircraft_id = Column(Integer, ForeignKey('aircraft.id'), nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    query_id: Mapped[int] = mapped_column(ForeignKey('search_queries.id'))
+    aircraft_id: Mapped[int] = mapped_column(ForeignKey('aircraft.id'))
+    timestamp: Mapped[datetime | None] = mapped_column(default=datetime.utcnow)
     
     # Relationships
-    query = relationship("SearchQuery", back_populates="results")
-    aircraft = relationship("Aircraft", back_populates="search_results")
+    query: Mapped["SearchQuery"] = relationship(back_populates="results", lazy="select")
+    aircraft: Mapped["Aircraft"] = relationship(back_populates="search_results", lazy="select")
     
     def __repr__(self):
         return f"<SearchResult(aircraft='{self.aircraft.icao24}')>"
@@ -109,49 +167,114 @@ class EmergencyPrediction(Base):
     """
     __tablename__ = 'emergency_predictions'
     
-    id = Column(Integer, primary_key=True)
-    aircraft_id = Column(Integer, ForeignKey('aircraft.id'), nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    aircraft_id: Mapped[int] = mapped_column(ForeignKey('aircraft.id'))
+    timestamp: Mapped[datetime | None] = mapped_column(default=datetime.utcnow, index=True)
     
     # Aircraft parameters at prediction time
-    latitude = Column(Float, nullable=False)
-    longitude = Column(Float, nullable=False)
-    altitude = Column(Float, nullable=False)
-    ground_speed = Column(Float)
-    heading = Column(Float)
-    vertical_speed = Column(Float)
+    latitude: Mapped[float]
+    longitude: Mapped[float]
+    altitude: Mapped[float]
+    ground_speed: Mapped[float | None]
+    heading: Mapped[float | None]
+    vertical_speed: Mapped[float | None]
     
     # Environment conditions
-    wind_speed = Column(Float)
-    wind_direction = Column(Float)
+    wind_speed: Mapped[float | None]
+    wind_direction: Mapped[float | None]
     
     # Prediction parameters
-    aircraft_type = Column(String(50))
-    glide_ratio = Column(Float)
+    aircraft_type: Mapped[str | None] = mapped_column(String(50))
+    glide_ratio: Mapped[float | None]
     
     # Prediction results
-    predicted_landing_latitude = Column(Float, nullable=False)
-    predicted_landing_longitude = Column(Float, nullable=False)
-    glide_distance = Column(Float)  # in nautical miles
-    glide_time = Column(Float)  # in minutes
-    uncertainty_radius = Column(Float)  # in km
+    predicted_landing_latitude: Mapped[float]
+    predicted_landing_longitude: Mapped[float]
+    glide_distance: Mapped[float | None]  # in nautical miles
+    glide_time: Mapped[float | None]  # in minutes
+    uncertainty_radius: Mapped[float | None]  # in km
     
-    # Additional details if needed
-    details = Column(JSON)
+    # Additional details if needed; binary JSONB on PostgreSQL so it is stored
+    # pre-parsed and can be searched through a GIN index
+    details: Mapped[dict | None] = mapped_column(JSON().with_variant(JSONB(), 'postgresql'))
     
-    # Relationships
-    aircraft = relationship("Aircraft")
+    # Per-aircraft prediction history reads the newest rows first
+    __table_args__ = (
+        Index('ix_prediction_aircraft_ts', aircraft_id, timestamp.desc()),
+        Index('ix_pred_details_gin', details, postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
+    
+    # Relationships; the aircraft is always shown alongside a prediction
+    aircraft: Mapped["Aircraft"] = relationship(lazy="joined")
     
     def __repr__(self):
         return f"<EmergencyPrediction(aircraft='{self.aircraft.icao24}', time='{self.timestamp}')>"
 
 def create_tables():
     """Create all the tables in the database"""
+    # The trigram indexes need the pg_trgm operator classes
+    if engine.dialect.name == 'postgresql':
+        with engine.begin() as connection:
+            connection.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    
     Base.metadata.create_all(engine)
+    
+    if engine.dialect.name == 'postgresql':
+        inspector = inspect(engine)
+        
+        # Prediction details used to be stored as json on PostgreSQL; convert
+        # existing tables to jsonb so the GIN index can be built on them
+        columns = inspector.get_columns('emergency_predictions')
+        details_type = next(c['type'] for c in columns if c['name'] == 'details')
+        if not isinstance(details_type, JSONB):
+            with engine.begin() as connection:
+                connection.execute(text(
+                    'ALTER TABLE emergency_predictions ALTER COLUMN details TYPE jsonb USING details::jsonb'
+                ))
+        
+        # Position flight values used to be double precision and the coordinates
+        # unchecked; narrow the columns in one table rewrite and add the CHECKs
+        # as NOT VALID, so existing rows aren't rescanned (new rows are checked)
+        positions = AircraftPosition.__table__
+        column_types = {c['name']: c['type'] for c in inspector.get_columns(positions.name)}
+        to_real = [
+            column.name for column in positions.columns
+            if isinstance(column.type, Float) and column.type.precision == 24
+            and not isinstance(column_types[column.name], REAL)
+        ]
+        existing_checks = {c['name'] for c in inspector.get_check_constraints(positions.name)}
+        missing_checks = [
+            constraint for constraint in positions.constraints
+            if isinstance(constraint, CheckConstraint) and constraint.name not in existing_checks
+        ]
+        if to_real or missing_checks:
+            with engine.begin() as connection:
+                if to_real:
+                    connection.execute(text(
+                        f'ALTER TABLE {positions.name} '
+                        + ', '.join(f'ALTER COLUMN {name} TYPE real' for name in to_real)
+                    ))
+                for constraint in missing_checks:
+                    connection.execute(text(
+                        f'ALTER TABLE {positions.name} ADD CONSTRAINT {constraint.name} '
+                        f'CHECK ({constraint.sqltext}) NOT VALID'
+                    ))
+    
+    # create_all skips tables that already exist, so add any indexes
+    # introduced since those tables were first created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+# Build the session factory once; objects stay readable after commit so callers
+# can use what the helpers return once the session is closed
+SessionFactory = sessionmaker(bind=engine, expire_on_commit=False)
+
+# One session per thread (or greenlet under gevent), reused across calls
+Session = scoped_session(SessionFactory)
 
 def get_session():
     """Get a session to interact with the database"""
-    Session = sessionmaker(bind=engine)
     return Session()
 
 # Create tables if this file is run directly
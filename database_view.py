@@ -6,6 +6,7 @@ import streamlit as st
 from datetime import datetime, timedelta
 import pandas as pd
 import folium
+from folium.plugins import FastMarkerCluster
 from streamlit_folium import folium_static
 
 # Import database models and functions
@@ -13,10 +14,116 @@ from database_models import Aircraft, AircraftPosition, EmergencyPrediction, Sea
 from db_utils import (
     get_recent_aircraft, get_aircraft_positions, 
     get_search_history, get_prediction_history,
+    count_search_history, count_prediction_history,
+    get_search_counts_per_day, get_search_counts_by_type,
     find_aircraft_by_callsign, find_aircraft_by_icao24, 
     find_aircraft_by_country, get_aircraft_by_id
 )
 
+# Display headers for rows fetched with db_utils.AIRCRAFT_COLUMNS and SEARCH_QUERY_COLUMNS
+AIRCRAFT_TABLE_COLUMNS = ["ID", "ICAO24", "Callsign", "Aircraft Type", "Origin Country", "Last Updated"]
+SEARCH_TABLE_COLUMNS = ["ID", "Search Type", "Search Value", "Timestamp"]
+PREDICTION_TABLE_COLUMNS = ["ID", "Aircraft", "Timestamp", "Aircraft Type", "Glide Distance (nm)", "Glide Time (min)"]
+
+# Builds each clustered position marker in the browser from a [lat, lon, popup] row,
+# styled like the explicit blue plane markers
+POSITION_MARKER_CALLBACK = """
+var callback = function (row) {
+    var icon = L.AwesomeMarkers.icon({icon: 'plane', prefix: 'fa', markerColor: 'blue'});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup(row[2], {maxWidth: 300});
+    return marker;
+};
+"""
+
+# Look-back window for each history time period; "All Time" has no cutoff
+TIME_PERIOD_WINDOWS = {
+    "Last 24 Hours": timedelta(days=1),
+    "Last Week": timedelta(days=7),
+    "Last Month": timedelta(days=30),
+    "All Time": None
+}
+
+# History listings are fetched one page at a time
+HISTORY_PAGE_SIZE = 100
+
+def history_cutoff(time_period):
+    """Return the earliest timestamp to include for a history time period"""
+    window = TIME_PERIOD_WINDOWS[time_period]
+    return datetime.utcnow() - window if window else None
+
+def last_page(total):
+    """Return the zero-based index of the last history page holding total records"""
+    return max(0, (total - 1) // HISTORY_PAGE_SIZE)
+
+def page_caption(page, rows_on_page, total):
+    """Describe which rows of the full history the current page shows"""
+    first = page * HISTORY_PAGE_SIZE + 1
+    return f"Showing {first}-{first + rows_on_page - 1} of {total} records"
+
+# Loaders are cached by their filters for a minute, so reruns triggered by
+# other widgets reuse the last result instead of querying again. Keying on the
+# time period rather than the cutoff keeps the key stable between reruns.
+@st.cache_data(ttl=60)
+def load_recent_aircraft(limit):
+    """Load the most recently updated aircraft"""
+    return get_recent_aircraft(limit=limit)
+
+@st.cache_data(ttl=60)
+def load_aircraft(aircraft_id):
+    """Load one aircraft by ID; its details rarely change while positions are browsed"""
+    return get_aircraft_by_id(aircraft_id)
+
+@st.cache_data(ttl=60)
+def load_search_history(time_period, page):
+    """Load one page of the search history for a time period"""
+    return get_search_history(limit=HISTORY_PAGE_SIZE, since=history_cutoff(time_period), page=page)
+
+@st.cache_data(ttl=60)
+def count_searches(time_period):
+    """Count the searches in a time period"""
+    return count_search_history(since=history_cutoff(time_period))
+
+@st.cache_data(ttl=60)
+def load_search_analytics(time_period):
+    """Load the per-day and per-type search counts for a time period"""
+    cutoff = history_cutoff(time_period)
+    per_day = pd.DataFrame.from_records(get_search_counts_per_day(since=cutoff), columns=["Date", "Count"])
+    by_type = pd.DataFrame.from_records(get_search_counts_by_type(since=cutoff), columns=["Search Type", "Count"])
+    return per_day, by_type
+
+@st.cache_data(ttl=60)
+def load_prediction_history(time_period, page):
+    """Load one page of the prediction history for a time period"""
+    return get_prediction_history(limit=HISTORY_PAGE_SIZE, since=history_cutoff(time_period), page=page)
+
+@st.cache_data(ttl=60)
+def count_predictions(time_period):
+    """Count the predictions in a time period"""
+    return count_prediction_history(since=history_cutoff(time_period))
+
+def format_timestamps(column):
+    """Format a datetime column for display, showing N/A for missing values"""
+    return pd.to_datetime(column).dt.strftime("%Y-%m-%d %H:%M:%S").fillna("N/A")
+
+def format_whole_numbers(column):
+    """Truncate a numeric column to whole numbers, showing N/A for missing or zero values"""
+    values = column.fillna(0)
+    return values.astype(int).astype(object).where(values != 0, "N/A")
+
+def fill_blank(column, default):
+    """Replace missing or empty values in a column with a default label"""
+    return column.where(column.notna() & (column != ""), default)
+
+def aircraft_dataframe(aircraft_list):
+    """Build the aircraft table straight from AIRCRAFT_COLUMNS rows"""
+    df = pd.DataFrame.from_records(aircraft_list, columns=AIRCRAFT_TABLE_COLUMNS)
+    df["Callsign"] = fill_blank(df["Callsign"], "N/A")
+    df["Aircraft Type"] = fill_blank(df["Aircraft Type"], "Unknown")
+    df["Origin Country"] = fill_blank(df["Origin Country"], "Unknown")
+    df["Last Updated"] = format_timestamps(df["Last Updated"])
+    return df
+
 def show_database_view():
     """
     Display the database records in a Streamlit interface
@@ -62,10 +169,13 @@ def show_aircraft_records():
         else:
             search_value = st.text_input(f"Enter {search_type}")
     
+    # The search parameters identify which stored results are still current
+    search_params = (search_type, limit if search_type == "Recent" else search_value)
+    
     if st.button("Search Aircraft"):
         with st.spinner("Searching..."):
             if search_type == "Recent":
-                aircraft_list = get_recent_aircraft(limit=limit)
+                aircraft_list = load_recent_aircraft(limit)
             elif search_type == "Callsign":
                 aircraft_list = find_aircraft_by_callsign(search_value)
             elif search_type == "ICAO24":
@@ -73,40 +183,32 @@ def show_aircraft_records():
             elif search_type == "Country":
                 aircraft_list = find_aircraft_by_country(search_value)
             
-            # Display results
-            if aircraft_list:
-                # Convert to DataFrame for display
-                data = []
-                for a in aircraft_list:
-                    data.append({
-                        "ID": a.id,
-                        "ICAO24": a.icao24,
-                        "Callsign": a.callsign or "N/A",
-                        "Aircraft Type": a.aircraft_type or "Unknown",
-                        "Origin Country": a.origin_country or "Unknown",
-                        "Last Updated": a.last_updated.strftime("%Y-%m-%d %H:%M:%S") if a.last_updated else "N/A"
-                    })
-                
-                df = pd.DataFrame(data)
-                st.dataframe(df)
-                
-                # Store in session state for selection
-                st.session_state.aircraft_list = aircraft_list
-                
-                # Let user select an aircraft to view details
-                aircraft_ids = [a.id for a in aircraft_list]
-                if aircraft_ids:
-                    selected_id = st.selectbox(
-                        "Select Aircraft to View Positions",
-                        options=aircraft_ids,
-                        format_func=lambda x: f"ID: {x} - {next((a.callsign for a in aircraft_list if a.id == x), 'Unknown')}"
-                    )
-                    
-                    if st.button("View Positions"):
-                        st.session_state.selected_aircraft_id = selected_id
-                        st.session_state.show_positions = True
-            else:
-                st.info("No aircraft found matching the search criteria.")
+            # Store in session state for selection; the rows are plain values,
+            # not ORM objects, so they stay usable on later reruns
+            st.session_state.aircraft_results = (search_params, aircraft_list)
+    
+    # Display results of the current search, including on reruns caused by
+    # the widgets below; results from other search parameters are ignored
+    stored_params, aircraft_list = st.session_state.get("aircraft_results", (None, None))
+    if stored_params == search_params:
+        if aircraft_list:
+            # Convert to DataFrame for display
+            df = aircraft_dataframe(aircraft_list)
+            st.dataframe(df)
+            
+            # Let user select an aircraft to view details
+            callsigns = {a.id: a.callsign for a in aircraft_list}
+            selected_id = st.selectbox(
+                "Select Aircraft to View Positions",
+                options=list(callsigns),
+                format_func=lambda x: f"ID: {x} - {callsigns.get(x, 'Unknown')}"
+            )
+            
+            if st.button("View Positions"):
+                st.session_state.selected_aircraft_id = selected_id
+                st.session_state.show_positions = True
+        else:
+            st.info("No aircraft found matching the search criteria.")
     
     # Show positions if selected
     if 'show_positions' in st.session_state and st.session_state.show_positions:
@@ -115,7 +217,7 @@ def show_aircraft_records():
 
 def show_aircraft_positions(aircraft_id):
     """Display positions for a specific aircraft"""
-    aircraft = get_aircraft_by_id(aircraft_id)
+    aircraft = load_aircraft(aircraft_id)
     
     if not aircraft:
         st.error(f"Aircraft with ID {aircraft_id} not found.")
@@ -123,60 +225,66 @@ def show_aircraft_positions(aircraft_id):
     
     st.subheader(f"Positions for {aircraft.callsign or aircraft.icao24}")
     
-    # Get positions
-    positions = get_aircraft_positions(aircraft_id, limit=50)
+    # Get positions, oldest to newest, ready for drawing the track
+    positions = get_aircraft_positions(aircraft_id, limit=50, order='asc')
     
     if not positions:
         st.info("No position records found for this aircraft.")
         return
     
-    # Display positions in a table
-    data = []
-    for p in positions:
-        data.append({
-            "Timestamp": p.timestamp.strftime("%Y-%m-%d %H:%M:%S") if p.timestamp else "N/A",
-            "Latitude": p.latitude,
-            "Longitude": p.longitude,
-            "Altitude (ft)": int(p.altitude) if p.altitude else "N/A",
-            "Ground Speed (kts)": int(p.ground_speed) if p.ground_speed else "N/A",
-            "Heading (°)": int(p.heading) if p.heading else "N/A",
-            "Vertical Speed (ft/min)": int(p.vertical_speed) if p.vertical_speed else "N/A",
-            "On Ground": "Yes" if p.on_ground else "No"
-        })
-    
-    df = pd.DataFrame(data)
-    st.dataframe(df)
+    # Display positions in a table, formatting each column once for the table and popups
+    records = pd.DataFrame.from_records(positions, columns=positions[0]._fields)
+    df = pd.DataFrame({
+        "Timestamp": format_timestamps(records["timestamp"]),
+        "Latitude": records["latitude"],
+        "Longitude": records["longitude"],
+        "Altitude (ft)": format_whole_numbers(records["altitude"]),
+        "Ground Speed (kts)": format_whole_numbers(records["ground_speed"]),
+        "Heading (°)": format_whole_numbers(records["heading"]),
+        "Vertical Speed (ft/min)": format_whole_numbers(records["vertical_speed"]),
+        "On Ground": records["on_ground"].fillna(False).astype(bool).map({True: "Yes", False: "No"})
+    })
+    
+    # List the newest position first
+    st.dataframe(df.iloc[::-1].reset_index(drop=True))
     
     # Show map of positions
     st.subheader("Position Map")
     
     # Create map centered on the most recent position
-    latest_pos = positions[0]
+    latest_pos = positions[-1]
     m = folium.Map(
         location=[latest_pos.latitude, latest_pos.longitude],
         zoom_start=10,
         tiles='OpenStreetMap'
     )
     
-    # Add markers for each position
-    coordinates = []
-    for p in reversed(positions):  # Reverse to show oldest to newest
-        coordinates.append([p.latitude, p.longitude])
-        
-        # Create popup text
-        popup_text = f"""
-        <b>Time:</b> {p.timestamp.strftime('%Y-%m-%d %H:%M:%S') if p.timestamp else 'N/A'}<br>
-        <b>Altitude:</b> {int(p.altitude) if p.altitude else 'N/A'} ft<br>
-        <b>Speed:</b> {int(p.ground_speed) if p.ground_speed else 'N/A'} kts<br>
-        <b>Heading:</b> {int(p.heading) if p.heading else 'N/A'}°<br>
-        <b>Vertical Rate:</b> {int(p.vertical_speed) if p.vertical_speed else 'N/A'} ft/min
-        """
-        
-        # Add marker
+    # Track coordinates in time order, taken straight from the table columns
+    coordinates = df[["Latitude", "Longitude"]].to_numpy().tolist()
+    
+    # Build every popup at once from the formatted table columns
+    popups = (
+        "<b>Time:</b> " + df["Timestamp"]
+        + "<br><b>Altitude:</b> " + df["Altitude (ft)"].astype(str)
+        + " ft<br><b>Speed:</b> " + df["Ground Speed (kts)"].astype(str)
+        + " kts<br><b>Heading:</b> " + df["Heading (°)"].astype(str)
+        + "°<br><b>Vertical Rate:</b> " + df["Vertical Speed (ft/min)"].astype(str) + " ft/min"
+    )
+    
+    # Mark the first and latest positions explicitly, the latest in red
+    endpoints = [(0, 'blue'), (len(positions) - 1, 'red')] if len(positions) > 1 else [(0, 'red')]
+    for i, color in endpoints:
         folium.Marker(
-            location=[p.latitude, p.longitude],
-            popup=folium.Popup(popup_text, max_width=300),
-            icon=folium.Icon(color='blue' if p != latest_pos else 'red', icon='plane', prefix='fa')
+            location=coordinates[i],
+            popup=folium.Popup(popups.iloc[i], max_width=300),
+            icon=folium.Icon(color=color, icon='plane', prefix='fa')
+        ).add_to(m)
+    
+    # Cluster the positions in between, rendered in the browser from one data array
+    if len(positions) > 2:
+        FastMarkerCluster(
+            [[lat, lon, popup] for (lat, lon), popup in zip(coordinates[1:-1], popups.iloc[1:-1])],
+            callback=POSITION_MARKER_CALLBACK
         ).add_to(m)
     
     # Add polyline connecting the points
@@ -229,18 +337,7 @@ def show_position_records():
             # Display results
             if aircraft_list:
                 # Convert to DataFrame for display
-                data = []
-                for a in aircraft_list:
-                    data.append({
-                        "ID": a.id,
-                        "ICAO24": a.icao24,
-                        "Callsign": a.callsign or "N/A",
-                        "Aircraft Type": a.aircraft_type or "Unknown",
-                        "Origin Country": a.origin_country or "Unknown",
-                        "Last Updated": a.last_updated.strftime("%Y-%m-%d %H:%M:%S") if a.last_updated else "N/A"
-                    })
-                
-                df = pd.DataFrame(data)
+                df = aircraft_dataframe(aircraft_list)
                 st.dataframe(df)
                 
                 # Let user select an aircraft to view positions
@@ -263,82 +360,50 @@ def show_search_records():
     st.header("Search History")
     
     # Get search history
-    time_period = st.selectbox(
-        "Time Period",
-        ["Last 24 Hours", "Last Week", "Last Month", "All Time"]
-    )
+    period_col, page_col = st.columns([3, 1])
     
+    with period_col:
+        time_period = st.selectbox(
+            "Time Period",
+            list(TIME_PERIOD_WINDOWS)
+        )
+    
+    with page_col:
+        # Keyed by period, so choosing another period starts again from page 1
+        page = st.number_input("Page", min_value=1, step=1, key=f"search_page_{time_period}") - 1
+    
+    # Keep the history open while the user pages through it
     if st.button("View Search History"):
-        # Get appropriate limit based on time period
-        if time_period == "Last 24 Hours":
-            limit = 500
-        elif time_period == "Last Week":
-            limit = 1000
-        elif time_period == "Last Month":
-            limit = 5000
-        else:  # All Time
-            limit = 10000
-        
-        searches = get_search_history(limit=limit)
+        st.session_state.show_search_history = True
+    
+    if st.session_state.get("show_search_history"):
+        # A page past the end of this period's history shows its last page
+        total = count_searches(time_period)
+        page = min(page, last_page(total))
         
-        # Filter by time period if needed
-        if time_period != "All Time":
-            now = datetime.utcnow()
-            if time_period == "Last 24 Hours":
-                cutoff = now - timedelta(days=1)
-            elif time_period == "Last Week":
-                cutoff = now - timedelta(days=7)
-            elif time_period == "Last Month":
-                cutoff = now - timedelta(days=30)
-                
-            searches = [s for s in searches if s.timestamp and s.timestamp >= cutoff]
+        # Time filter and paging are applied in the query for the chosen period
+        searches = load_search_history(time_period, page)
         
         if searches:
+            st.caption(page_caption(page, len(searches), total))
+            
             # Display in a table
-            data = []
-            for s in searches:
-                data.append({
-                    "ID": s.id,
-                    "Search Type": s.search_type,
-                    "Search Value": s.search_value,
-                    "Timestamp": s.timestamp.strftime("%Y-%m-%d %H:%M:%S") if s.timestamp else "N/A"
-                })
+            df = pd.DataFrame.from_records(searches, columns=SEARCH_TABLE_COLUMNS)
             
-            df = pd.DataFrame(data)
+            df["Timestamp"] = format_timestamps(df["Timestamp"])
             st.dataframe(df)
             
-            # Basic analytics
+            # Basic analytics over the whole time period, counted by the database
             st.subheader("Search Analytics")
+            date_df, type_df = load_search_analytics(time_period)
             
             # Searches per day
-            if searches and searches[0].timestamp:
+            if not date_df.empty:
                 st.write("### Searches Per Day")
-                
-                # Group by day
-                dates = [s.timestamp.date() for s in searches if s.timestamp]
-                date_counts = {}
-                for date in dates:
-                    date_counts[date] = date_counts.get(date, 0) + 1
-                
-                # Create DataFrame for chart
-                date_df = pd.DataFrame({
-                    "Date": list(date_counts.keys()),
-                    "Count": list(date_counts.values())
-                })
-                
-                date_df = date_df.sort_values("Date")
                 st.bar_chart(date_df.set_index("Date"))
             
             # Search types distribution
             st.write("### Search Types Distribution")
-            type_counts = {}
-            for s in searches:
-                type_counts[s.search_type] = type_counts.get(s.search_type, 0) + 1
-            
-            type_df = pd.DataFrame({
-                "Search Type": list(type_counts.keys()),
-                "Count": list(type_counts.values())
-            })
             
             # Use columns for chart and data
             type_col1, type_col2 = st.columns([2, 1])
@@ -356,62 +421,59 @@ def show_prediction_records():
     st.header("Emergency Landing Predictions")
     
     # Get prediction history
-    time_period = st.selectbox(
-        "Time Period",
-        ["Last 24 Hours", "Last Week", "Last Month", "All Time"],
-        key="pred_time_period"
-    )
+    period_col, page_col = st.columns([3, 1])
     
+    with period_col:
+        time_period = st.selectbox(
+            "Time Period",
+            list(TIME_PERIOD_WINDOWS),
+            key="pred_time_period"
+        )
+    
+    with page_col:
+        # Keyed by period, so choosing another period starts again from page 1
+        page = st.number_input("Page", min_value=1, step=1, key=f"pred_page_{time_period}") - 1
+    
+    # Keep the history open while the user pages through it
     if st.button("View Prediction History"):
-        # Get appropriate limit based on time period
-        if time_period == "Last 24 Hours":
-            limit = 500
-        elif time_period == "Last Week":
-            limit = 1000
-        elif time_period == "Last Month":
-            limit = 5000
-        else:  # All Time
-            limit = 10000
-        
-        predictions = get_prediction_history(limit=limit)
+        st.session_state.show_prediction_history = True
+    
+    if st.session_state.get("show_prediction_history"):
+        # A page past the end of this period's history shows its last page
+        total = count_predictions(time_period)
+        page = min(page, last_page(total))
         
-        # Filter by time period if needed
-        if time_period != "All Time":
-            now = datetime.utcnow()
-            if time_period == "Last 24 Hours":
-                cutoff = now - timedelta(days=1)
-            elif time_period == "Last Week":
-                cutoff = now - timedelta(days=7)
-            elif time_period == "Last Month":
-                cutoff = now - timedelta(days=30)
-                
-            predictions = [p for p in predictions if p.timestamp and p.timestamp >= cutoff]
+        # Time filter and paging are applied in the query for the chosen period
+        predictions = load_prediction_history(time_period, page)
         
         if predictions:
-            # Display in a table
-            data = []
-            for p in predictions:
-                aircraft = get_aircraft_by_id(p.aircraft_id)
-                aircraft_info = f"{aircraft.callsign or aircraft.icao24}" if aircraft else f"ID: {p.aircraft_id}"
-                
-                data.append({
-                    "ID": p.id,
-                    "Aircraft": aircraft_info,
-                    "Timestamp": p.timestamp.strftime("%Y-%m-%d %H:%M:%S") if p.timestamp else "N/A",
-                    "Aircraft Type": p.aircraft_type or "Unknown",
-                    "Glide Distance (nm)": round(p.glide_distance, 2) if p.glide_distance else "N/A",
-                    "Glide Time (min)": round(p.glide_time, 2) if p.glide_time else "N/A"
-                })
+            st.caption(page_caption(page, len(predictions), total))
             
-            df = pd.DataFrame(data)
+            # Display in a table, built from row tuples rather than per-row dicts
+            df = pd.DataFrame.from_records(
+                (
+                    (
+                        p.id,
+                        f"{p.aircraft_callsign or p.aircraft_icao24}" if p.aircraft_icao24 else f"ID: {p.aircraft_id}",
+                        p.timestamp,
+                        p.aircraft_type or "Unknown",
+                        round(p.glide_distance, 2) if p.glide_distance else "N/A",
+                        round(p.glide_time, 2) if p.glide_time else "N/A"
+                    )
+                    for p in predictions
+                ),
+                columns=PREDICTION_TABLE_COLUMNS
+            )
+            df["Timestamp"] = format_timestamps(df["Timestamp"])
             st.dataframe(df)
             
             # Let user select a prediction to view on map
             if predictions:
+                labels = dict(zip(df["ID"].tolist(), "ID: " + df["ID"].astype(str) + " - " + df["Timestamp"]))
                 selected_id = st.selectbox(
                     "Select Prediction to View on Map",
-                    options=[p.id for p in predictions],
-                    format_func=lambda x: f"ID: {x} - {next((p.timestamp.strftime('%Y-%m-%d %H:%M:%S') if p.timestamp else 'N/A' for p in predictions if p.id == x), 'Unknown')}"
+                    options=list(labels),
+                    format_func=labels.get
                 )
                 
                 if st.button("View Prediction Map"):
@@ -431,8 +493,7 @@ def show_prediction_map(prediction_id, predictions):
     st.subheader(f"Emergency Landing Prediction {prediction_id}")
     
     # Get aircraft details
-    aircraft = get_aircraft_by_id(prediction.aircraft_id)
-    aircraft_info = f"{aircraft.callsign or aircraft.icao24}" if aircraft else f"ID: {prediction.aircraft_id}"
+    aircraft_info = f"{prediction.aircraft_callsign or prediction.aircraft_icao24}" if prediction.aircraft_icao24 else f"ID: {prediction.aircraft_id}"
     
     # Display prediction details
     col1, col2 = st.columns(2)
@@ -4,11 +4,63 @@ Database utility functions for the Aircraft Search Prediction System
 
 from datetime import datetime
 import json
+from sqlalchemy import Date, func, insert, lambda_stmt, select
 from database_models import (
-    get_session, Aircraft, AircraftPosition, 
+    engine, get_session, Aircraft, AircraftPosition, 
     SearchQuery, SearchResult, EmergencyPrediction
 )
 
+# INSERT with ON CONFLICT support for the configured database
+# (PostgreSQL in production, SQLite as the development fallback)
+if engine.dialect.name == 'postgresql':
+    from sqlalchemy.dialects.postgresql import insert as upsert_insert
+else:
+    from sqlalchemy.dialects.sqlite import insert as upsert_insert
+
+# Columns fetched by the *_rows getters, which read through Core and skip the ORM
+AIRCRAFT_COLUMNS = (
+    Aircraft.id, Aircraft.icao24, Aircraft.callsign,
+    Aircraft.aircraft_type, Aircraft.origin_country, Aircraft.last_updated
+)
+POSITION_COLUMNS = (
+    AircraftPosition.id, AircraftPosition.timestamp, AircraftPosition.latitude,
+    AircraftPosition.longitude, AircraftPosition.altitude, AircraftPosition.ground_speed,
+    AircraftPosition.heading, AircraftPosition.vertical_speed, AircraftPosition.on_ground
+)
+SEARCH_QUERY_COLUMNS = (
+    SearchQuery.id, SearchQuery.search_type, SearchQuery.search_value, SearchQuery.timestamp
+)
+PREDICTION_COLUMNS = (
+    EmergencyPrediction.id, EmergencyPrediction.aircraft_id, EmergencyPrediction.timestamp,
+    EmergencyPrediction.latitude, EmergencyPrediction.longitude, EmergencyPrediction.altitude,
+    EmergencyPrediction.predicted_landing_latitude, EmergencyPrediction.predicted_landing_longitude,
+    EmergencyPrediction.glide_distance, EmergencyPrediction.glide_time, EmergencyPrediction.aircraft_type
+)
+# Prediction history adds what the map view shows plus the aircraft's identity
+PREDICTION_HISTORY_COLUMNS = PREDICTION_COLUMNS + (
+    EmergencyPrediction.glide_ratio, EmergencyPrediction.uncertainty_radius,
+    Aircraft.callsign.label('aircraft_callsign'), Aircraft.icao24.label('aircraft_icao24')
+)
+
+def _build_aircraft_upsert():
+    """
+    Build the aircraft upsert: insert a new aircraft, or refresh an existing
+    one keyed by icao24. Missing or empty fields keep their stored values.
+    """
+    statement = upsert_insert(Aircraft)
+    excluded = statement.excluded
+    return statement.on_conflict_do_update(
+        index_elements=[Aircraft.icao24],
+        set_={
+            'callsign': func.coalesce(func.nullif(excluded.callsign, ''), Aircraft.callsign),
+            'aircraft_type': func.coalesce(func.nullif(excluded.aircraft_type, ''), Aircraft.aircraft_type),
+            'origin_country': func.coalesce(func.nullif(excluded.origin_country, ''), Aircraft.origin_country),
+            'last_updated': excluded.last_updated
+        }
+    )
+
+AIRCRAFT_UPSERT = _build_aircraft_upsert()
+
 def create_or_update_aircraft(icao24, callsign=None, aircraft_type=None, origin_country=None):
     """
     Create a new aircraft record or update an existing one
@@ -29,48 +81,61 @@ def create_or_update_aircraft(icao24, callsign=None, aircraft_type=None, origin_
     dict
         A dictionary containing the created or updated aircraft record's data
     """
-    session = get_session()
-    try:
-        # Check if aircraft already exists
-        aircraft = session.query(Aircraft).filter_by(icao24=icao24).first()
-        
-        if aircraft:
-            # Update existing aircraft
-            if callsign:
-                aircraft.callsign = callsign
-            if aircraft_type:
-                aircraft.aircraft_type = aircraft_type
-            if origin_country:
-                aircraft.origin_country = origin_country
-            aircraft.last_updated = datetime.utcnow()
-        else:
-            # Create new aircraft
-            aircraft = Aircraft(
-                icao24=icao24,
-                callsign=callsign,
-                aircraft_type=aircraft_type,
-                origin_country=origin_country
-            )
-            session.add(aircraft)
-            
-        session.commit()
+    with get_session() as session, session.begin():
+        # One round trip inserts or updates the aircraft and reads it back
+        aircraft = session.execute(
+            AIRCRAFT_UPSERT.returning(*AIRCRAFT_COLUMNS),
+            {
+                'icao24': icao24,
+                'callsign': callsign,
+                'aircraft_type': aircraft_type,
+                'origin_country': origin_country,
+                'last_updated': datetime.utcnow()
+            }
+        ).one()
+    
+    return aircraft._asdict()
+
+def upsert_aircraft_bulk(aircraft, chunk_size=1000):
+    """
+    Create or update many aircraft records in one transaction, sending the
+    upsert in executemany chunks
+    
+    Parameters:
+    -----------
+    aircraft : list
+        Dicts with an icao24 key and optionally callsign, aircraft_type and
+        origin_country. When an icao24 appears more than once, the last entry wins.
+    chunk_size : int, optional
+        The maximum number of rows sent per upsert statement
         
-        # Create a dictionary of the aircraft data before closing the session
-        aircraft_data = {
-            'id': aircraft.id,
-            'icao24': aircraft.icao24,
-            'callsign': aircraft.callsign,
-            'aircraft_type': aircraft.aircraft_type,
-            'origin_country': aircraft.origin_country,
-            'last_updated': aircraft.last_updated.isoformat() if aircraft.last_updated else None
+    Returns:
+    --------
+    dict
+        The database ID of each aircraft, keyed by ICAO24 address
+    """
+    now = datetime.utcnow()
+    # A single statement cannot update the same row twice, so collapse duplicates
+    rows = list({
+        a['icao24']: {
+            'icao24': a['icao24'],
+            'callsign': a.get('callsign'),
+            'aircraft_type': a.get('aircraft_type'),
+            'origin_country': a.get('origin_country'),
+            'last_updated': now
         }
-        
-        return aircraft_data
-    except Exception as e:
-        session.rollback()
-        raise e
-    finally:
-        session.close()
+        for a in aircraft
+    }.values())
+    if not rows:
+        return {}
+    
+    statement = AIRCRAFT_UPSERT.returning(Aircraft.icao24, Aircraft.id)
+    aircraft_ids = {}
+    with get_session() as session, session.begin():
+        for start in range(0, len(rows), chunk_size):
+            aircraft_ids.update(session.execute(statement, rows[start:start + chunk_size]).tuples().all())
+    
+    return aircraft_ids
 
 def store_aircraft_position(
     aircraft_id, latitude, longitude, altitude=None, 
@@ -103,8 +168,7 @@ def store_aircraft_position(
     AircraftPosition
         The created position record
     """
-    session = get_session()
-    try:
+    with get_session() as session, session.begin():
         position = AircraftPosition(
             aircraft_id=aircraft_id,
             latitude=latitude,
@@ -116,17 +180,45 @@ def store_aircraft_position(
             on_ground=on_ground
         )
         session.add(position)
-        session.commit()
-        return position
-    except Exception as e:
-        session.rollback()
-        raise e
-    finally:
-        session.close()
+    return position
 
-def store_search_query(search_type, search_value):
+def store_aircraft_positions_bulk(positions, chunk_size=500):
     """
-    Store a search query
+    Store many position records in one transaction, inserting them in
+    executemany chunks
+
+    Parameters:
+    -----------
+    positions : list
+        Dicts keyed by AircraftPosition column names (aircraft_id, latitude,
+        longitude and optionally altitude, ground_speed, heading,
+        vertical_speed, on_ground)
+    chunk_size : int, optional
+        The maximum number of rows sent per insert statement
+
+    Returns:
+    --------
+    int
+        The number of position records stored
+    """
+    if not positions:
+        return 0
+
+    with get_session() as session, session.begin():
+        for start in range(0, len(positions), chunk_size):
+            session.execute(insert(AircraftPosition), positions[start:start + chunk_size])
+    return len(positions)
+
+def _insert_search_results(session, query_id, aircraft_ids):
+    """Bulk insert the results of a search query; returns their IDs in input order"""
+    return session.scalars(
+        insert(SearchResult).returning(SearchResult.id, sort_by_parameter_order=True),
+        [{'query_id': query_id, 'aircraft_id': aircraft_id} for aircraft_id in aircraft_ids]
+    ).all()
+
+def log_search(search_type, search_value, aircraft_ids=None):
+    """
+    Store a search query and its results in a single transaction
     
     Parameters:
     -----------
@@ -134,57 +226,63 @@ def store_search_query(search_type, search_value):
         The type of search (callsign, icao24, country)
     search_value : str
         The value being searched for
+    aircraft_ids : list, optional
+        The IDs of the aircraft found
         
     Returns:
     --------
-    SearchQuery
-        The created search query record
+    tuple
+        (query_id, result_ids): the ID of the search query record and the IDs
+        of its search result records, in input order
     """
-    session = get_session()
-    try:
+    result_ids = []
+    with get_session() as session, session.begin():
         query = SearchQuery(
             search_type=search_type,
             search_value=search_value
         )
         session.add(query)
-        session.commit()
-        return query
-    except Exception as e:
-        session.rollback()
-        raise e
-    finally:
-        session.close()
+        # Flush to get the query ID for the results without committing
+        session.flush()
+        
+        if aircraft_ids:
+            result_ids = _insert_search_results(session, query.id, aircraft_ids)
+    return query.id, result_ids
 
-def store_search_result(query_id, aircraft_id):
-    """
-    Store a search result
-    
-    Parameters:
-    -----------
-    query_id : int
-        The ID of the search query
-    aircraft_id : int
-        The ID of the aircraft found
+def _prediction_row(
+    aircraft_id, current_position, aircraft_params, wind_conditions, 
+    aircraft_type, glide_ratio, prediction_results
+):
+    """Flatten a prediction's nested inputs into EmergencyPrediction column values"""
+    return {
+        'aircraft_id': aircraft_id,
         
-    Returns:
-    --------
-    SearchResult
-        The created search result record
-    """
-    session = get_session()
-    try:
-        result = SearchResult(
-            query_id=query_id,
-            aircraft_id=aircraft_id
-        )
-        session.add(result)
-        session.commit()
-        return result
-    except Exception as e:
-        session.rollback()
-        raise e
-    finally:
-        session.close()
+        # Current position and parameters
+        'latitude': current_position['latitude'],
+        'longitude': current_position['longitude'],
+        'altitude': current_position['altitude'],
+        'ground_speed': aircraft_params.get('ground_speed'),
+        'heading': aircraft_params.get('heading'),
+        'vertical_speed': aircraft_params.get('vertical_speed'),
+        
+        # Wind conditions
+        'wind_speed': wind_conditions.get('speed'),
+        'wind_direction': wind_conditions.get('direction'),
+        
+        # Aircraft type and glide ratio
+        'aircraft_type': aircraft_type,
+        'glide_ratio': glide_ratio,
+        
+        # Prediction results
+        'predicted_landing_latitude': prediction_results['landingPosition'][0],
+        'predicted_landing_longitude': prediction_results['landingPosition'][1],
+        'glide_distance': prediction_results.get('glideDistance'),
+        'glide_time': prediction_results.get('glideTime'),
+        'uncertainty_radius': prediction_results.get('uncertaintyRadius'),
+        
+        # Additional details
+        'details': prediction_results.get('details', {})
+    }
 
 def store_emergency_prediction(
     aircraft_id, current_position, aircraft_params, wind_conditions, 
@@ -215,45 +313,39 @@ def store_emergency_prediction(
     EmergencyPrediction
         The created prediction record
     """
-    session = get_session()
-    try:
-        prediction = EmergencyPrediction(
-            aircraft_id=aircraft_id,
-            
-            # Current position and parameters
-            latitude=current_position['latitude'],
-            longitude=current_position['longitude'],
-            altitude=current_position['altitude'],
-            ground_speed=aircraft_params.get('ground_speed'),
-            heading=aircraft_params.get('heading'),
-            vertical_speed=aircraft_params.get('vertical_speed'),
-            
-            # Wind conditions
-            wind_speed=wind_conditions.get('speed'),
-            wind_direction=wind_conditions.get('direction'),
-            
-            # Aircraft type and glide ratio
-            aircraft_type=aircraft_type,
-            glide_ratio=glide_ratio,
-            
-            # Prediction results
-            predicted_landing_latitude=prediction_results['landingPosition'][0],
-            predicted_landing_longitude=prediction_results['landingPosition'][1],
-            glide_distance=prediction_results.get('glideDistance'),
-            glide_time=prediction_results.get('glideTime'),
-            uncertainty_radius=prediction_results.get('uncertaintyRadius'),
-            
-            # Additional details
-            details=prediction_results.get('details', {})
-        )
+    with get_session() as session, session.begin():
+        prediction = EmergencyPrediction(**_prediction_row(
+            aircraft_id, current_position, aircraft_params, wind_conditions,
+            aircraft_type, glide_ratio, prediction_results
+        ))
         session.add(prediction)
-        session.commit()
-        return prediction
-    except Exception as e:
-        session.rollback()
-        raise e
-    finally:
-        session.close()
+    return prediction
+
+def store_emergency_predictions_bulk(predictions):
+    """
+    Store many emergency landing predictions in a single bulk insert
+    
+    Parameters:
+    -----------
+    predictions : list
+        Dicts with the store_emergency_prediction arguments (aircraft_id,
+        current_position, aircraft_params, wind_conditions, aircraft_type,
+        glide_ratio, prediction_results)
+        
+    Returns:
+    --------
+    list
+        The IDs of the created prediction records, in input order
+    """
+    if not predictions:
+        return []
+    
+    with get_session() as session, session.begin():
+        prediction_ids = session.scalars(
+            insert(EmergencyPrediction).returning(EmergencyPrediction.id, sort_by_parameter_order=True),
+            [_prediction_row(**prediction) for prediction in predictions]
+        ).all()
+    return prediction_ids
 
 def get_recent_aircraft(limit=100):
     """
@@ -267,18 +359,19 @@ def get_recent_aircraft(limit=100):
     Returns:
     --------
     list
-        A list of aircraft objects
+        A list of rows with the AIRCRAFT_COLUMNS fields
     """
-    session = get_session()
-    try:
-        aircraft = session.query(Aircraft).order_by(
-            Aircraft.last_updated.desc()
-        ).limit(limit).all()
+    # lambda_stmt caches the built statement; limit is passed as a bound parameter
+    statement = lambda_stmt(lambda: select(*AIRCRAFT_COLUMNS).order_by(
+        Aircraft.last_updated.desc()
+    ))
+    statement += lambda s: s.limit(limit)
+    
+    with get_session() as session:
+        aircraft = session.execute(statement).all()
         return aircraft
-    finally:
-        session.close()
 
-def get_aircraft_positions(aircraft_id, limit=10):
+def get_aircraft_positions(aircraft_id, limit=10, order='desc'):
     """
     Get recent positions for an aircraft
     
@@ -288,24 +381,31 @@ def get_aircraft_positions(aircraft_id, limit=10):
         The ID of the aircraft
     limit : int, optional
         The maximum number of positions to return
+    order : str, optional
+        'desc' to return the positions newest first, or 'asc' to return the
+        same most recent positions in chronological order
         
     Returns:
     --------
     list
-        A list of position objects
+        A list of rows with the POSITION_COLUMNS fields
     """
-    session = get_session()
-    try:
-        positions = session.query(AircraftPosition).filter_by(
-            aircraft_id=aircraft_id
-        ).order_by(
-            AircraftPosition.timestamp.desc()
-        ).limit(limit).all()
+    statement = select(*POSITION_COLUMNS).where(
+        AircraftPosition.aircraft_id == aircraft_id
+    ).order_by(
+        AircraftPosition.timestamp.desc()
+    ).limit(limit)
+    
+    if order == 'asc':
+        # Pick the most recent positions first, then put them in time order
+        recent = statement.subquery()
+        statement = select(recent).order_by(recent.c.timestamp.asc())
+    
+    with get_session() as session:
+        positions = session.execute(statement).all()
         return positions
-    finally:
-        session.close()
 
-def get_search_history(limit=10):
+def get_search_history(limit=10, since=None, page=0):
     """
     Get recent search queries
     
@@ -313,22 +413,105 @@ def get_search_history(limit=10):
     -----------
     limit : int, optional
         The maximum number of queries to return
+    since : datetime, optional
+        Only return queries made at or after this time
+    page : int, optional
+        The zero-based page to return, with limit queries per page
         
     Returns:
     --------
     list
-        A list of search query objects
+        A list of rows with the SEARCH_QUERY_COLUMNS fields
     """
-    session = get_session()
-    try:
-        queries = session.query(SearchQuery).order_by(
-            SearchQuery.timestamp.desc()
-        ).limit(limit).all()
+    # lambda_stmt caches each variant of the built statement; the cutoff and
+    # paging values are passed as bound parameters
+    offset = page * limit
+    statement = lambda_stmt(lambda: select(*SEARCH_QUERY_COLUMNS))
+    if since is not None:
+        statement += lambda s: s.where(SearchQuery.timestamp >= since)
+    statement += lambda s: s.order_by(
+        SearchQuery.timestamp.desc()
+    ).offset(offset).limit(limit)
+    
+    with get_session() as session:
+        queries = session.execute(statement).all()
         return queries
-    finally:
-        session.close()
 
-def get_prediction_history(limit=10):
+def count_search_history(since=None):
+    """
+    Count search queries, for paging through their history
+    
+    Parameters:
+    -----------
+    since : datetime, optional
+        Only count queries made at or after this time
+        
+    Returns:
+    --------
+    int
+        The number of matching queries
+    """
+    statement = select(func.count()).select_from(SearchQuery)
+    if since is not None:
+        statement = statement.where(SearchQuery.timestamp >= since)
+    
+    with get_session() as session:
+        count = session.execute(statement).scalar_one()
+        return count
+
+def get_search_counts_per_day(since=None):
+    """
+    Count search queries per calendar day, aggregated in the database
+    
+    Parameters:
+    -----------
+    since : datetime, optional
+        Only count queries made at or after this time
+        
+    Returns:
+    --------
+    list
+        A list of (day, count) rows in date order
+    """
+    day = func.date(SearchQuery.timestamp, type_=Date).label('day')
+    statement = select(day, func.count().label('count')).where(
+        SearchQuery.timestamp.is_not(None)
+    )
+    if since is not None:
+        statement = statement.where(SearchQuery.timestamp >= since)
+    
+    with get_session() as session:
+        counts = session.execute(
+            statement.group_by(day).order_by(day)
+        ).all()
+        return counts
+
+def get_search_counts_by_type(since=None):
+    """
+    Count search queries per search type, aggregated in the database
+    
+    Parameters:
+    -----------
+    since : datetime, optional
+        Only count queries made at or after this time
+        
+    Returns:
+    --------
+    list
+        A list of (search_type, count) rows, most frequent first
+    """
+    count = func.count().label('count')
+    statement = select(SearchQuery.search_type, count)
+    if since is not None:
+        statement = statement.where(SearchQuery.timestamp >= since)
+    
+    with get_session() as session:
+        counts = session.execute(
+            statement.group_by(SearchQuery.search_type).order_by(count.desc())
+        ).all()
+        return counts
+
+def get_prediction_history(limit=10, since=None, page=0):
     """
     Get recent emergency predictions
     
@@ -336,20 +519,54 @@ def get_prediction_history(limit=10):
     -----------
     limit : int, optional
         The maximum number of predictions to return
+    since : datetime, optional
+        Only return predictions made at or after this time
+    page : int, optional
+        The zero-based page to return, with limit predictions per page
         
     Returns:
     --------
     list
-        A list of prediction objects
+        A list of rows with the PREDICTION_HISTORY_COLUMNS fields
     """
-    session = get_session()
-    try:
-        predictions = session.query(EmergencyPrediction).order_by(
-            EmergencyPrediction.timestamp.desc()
-        ).limit(limit).all()
+    # Join the aircraft in so the listing needs a single query; lambda_stmt
+    # caches each variant of the built statement, with the cutoff and paging
+    # values passed as bound parameters
+    offset = page * limit
+    statement = lambda_stmt(lambda: select(*PREDICTION_HISTORY_COLUMNS).outerjoin(
+        Aircraft, Aircraft.id == EmergencyPrediction.aircraft_id
+    ))
+    if since is not None:
+        statement += lambda s: s.where(EmergencyPrediction.timestamp >= since)
+    statement += lambda s: s.order_by(
+        EmergencyPrediction.timestamp.desc()
+    ).offset(offset).limit(limit)
+    
+    with get_session() as session:
+        predictions = session.execute(statement).all()
         return predictions
-    finally:
-        session.close()
+
+def count_prediction_history(since=None):
+    """
+    Count emergency predictions, for paging through their history
+    
+    Parameters:
+    -----------
+    since : datetime, optional
+        Only count predictions made at or after this time
+        
+    Returns:
+    --------
+    int
+        The number of matching predictions
+    """
+    statement = select(func.count()).select_from(EmergencyPrediction)
+    if since is not None:
+        statement = statement.where(EmergencyPrediction.timestamp >= since)
+    
+    with get_session() as session:
+        count = session.execute(statement).scalar_one()
+        return count
 
 def find_aircraft_by_callsign(callsign):
     """
@@ -363,16 +580,15 @@ def find_aircraft_by_callsign(callsign):
     Returns:
     --------
     list
-        A list of matching aircraft
+        A list of rows with the AIRCRAFT_COLUMNS fields for matching aircraft
     """
-    session = get_session()
-    try:
-        aircraft = session.query(Aircraft).filter(
-            Aircraft.callsign.ilike(f"%{callsign}%")
+    with get_session() as session:
+        aircraft = session.execute(
+            select(*AIRCRAFT_COLUMNS).where(
+                Aircraft.callsign.ilike(f"%{callsign}%")
+            )
         ).all()
         return aircraft
-    finally:
-        session.close()
 
 def find_aircraft_by_icao24(icao24):
     """
@@ -386,16 +602,15 @@ def find_aircraft_by_icao24(icao24):
     Returns:
     --------
     list
-        A list of matching aircraft
+        A list of rows with the AIRCRAFT_COLUMNS fields for matching aircraft
     """
-    session = get_session()
-    try:
-        aircraft = session.query(Aircraft).filter(
-            Aircraft.icao24.ilike(f"%{icao24}%")
+    with get_session() as session:
+        aircraft = session.execute(
+            select(*AIRCRAFT_COLUMNS).where(
+                Aircraft.icao24.ilike(f"%{icao24}%")
+            )
         ).all()
         return aircraft
-    finally:
-        session.close()
 
 def find_aircraft_by_country(country):
     """
@@ -409,16 +624,15 @@ def find_aircraft_by_country(country):
     Returns:
     --------
     list
-        A list of matching aircraft
+        A list of rows with the AIRCRAFT_COLUMNS fields for matching aircraft
     """
-    session = get_session()
-    try:
-        aircraft = session.query(Aircraft).filter(
-            Aircraft.origin_country.ilike(f"%{country}%")
+    with get_session() as session:
+        aircraft = session.execute(
+            select(*AIRCRAFT_COLUMNS).where(
+                Aircraft.origin_country.ilike(f"%{country}%")
+            )
         ).all()
         return aircraft
-    finally:
-        session.close()
 
 def get_aircraft_by_id(aircraft_id):
     """
@@ -431,12 +645,171 @@ def get_aircraft_by_id(aircraft_id):
         
     Returns:
     --------
-    Aircraft
-        The aircraft object or None if not found
+    Row
+        A row with the AIRCRAFT_COLUMNS fields, or None if not found
     """
-    session = get_session()
-    try:
-        aircraft = session.query(Aircraft).filter_by(id=aircraft_id).first()
+    with get_session() as session:
+        aircraft = session.execute(
+            select(*AIRCRAFT_COLUMNS).where(Aircraft.id == aircraft_id)
+        ).first()
         return aircraft
-    finally:
-        session.close()
\ No newline at end of file
+
+def _fetch_rows(statement):
+    """Run a read-only statement on a pooled connection and return plain dicts"""
+    with engine.connect() as connection:
+        return [dict(row) for row in connection.execute(statement).mappings()]
+
+def _stream_rows(statement, chunk_size=100):
+    """
+    Run a read-only statement with a server-side cursor and yield plain dicts,
+    fetching chunk_size rows at a time. The connection is released once the
+    generator is exhausted or closed.
+    """
+    with engine.connect() as connection:
+        result = connection.execution_options(yield_per=chunk_size).execute(statement)
+        for row in result.mappings():
+            yield dict(row)
+
+def get_recent_aircraft_rows(limit=100):
+    """
+    Get recently updated aircraft as a stream of plain rows
+    
+    Parameters:
+    -----------
+    limit : int, optional
+        The maximum number of aircraft to return
+        
+    Returns:
+    --------
+    iterator
+        An iterator of dicts keyed by the AIRCRAFT_COLUMNS names
+    """
+    return _stream_rows(
+        select(*AIRCRAFT_COLUMNS).order_by(
+            Aircraft.last_updated.desc()
+        ).limit(limit)
+    )
+
+def get_aircraft_position_rows(aircraft_id, limit=10):
+    """
+    Get recent positions for an aircraft as a stream of plain rows
+    
+    Parameters:
+    -----------
+    aircraft_id : int
+        The ID of the aircraft
+    limit : int, optional
+        The maximum number of positions to return
+        
+    Returns:
+    --------
+    iterator
+        An iterator of dicts keyed by the POSITION_COLUMNS names
+    """
+    return _stream_rows(
+        select(*POSITION_COLUMNS).where(
+            AircraftPosition.aircraft_id == aircraft_id
+        ).order_by(
+            AircraftPosition.timestamp.desc()
+        ).limit(limit)
+    )
+
+def get_search_history_rows(limit=10):
+    """
+    Get recent search queries as a stream of plain rows
+    
+    Parameters:
+    -----------
+    limit : int, optional
+        The maximum number of queries to return
+        
+    Returns:
+    --------
+    iterator
+        An iterator of dicts keyed by the SEARCH_QUERY_COLUMNS names
+    """
+    return _stream_rows(
+        select(*SEARCH_QUERY_COLUMNS).order_by(
+            SearchQuery.timestamp.desc()
+        ).limit(limit)
+    )
+
+def get_prediction_history_rows(limit=10):
+    """
+    Get recent emergency predictions as a stream of plain rows
+    
+    Parameters:
+    -----------
+    limit : int, optional
+        The maximum number of predictions to return
+        
+    Returns:
+    --------
+    iterator
+        An iterator of dicts keyed by the PREDICTION_COLUMNS names
+    """
+    return _stream_rows(
+        select(*PREDICTION_COLUMNS).order_by(
+            EmergencyPrediction.timestamp.desc()
+        ).limit(limit)
+    )
+
+def find_aircraft_rows_by_callsign(callsign):
+    """
+    Find aircraft by callsign, returning plain rows
+    
+    Parameters:
+    -----------
+    callsign : str
+        The callsign to search for
+        
+    Returns:
+    --------
+    list
+        A list of dicts keyed by the AIRCRAFT_COLUMNS names
+    """
+    return _fetch_rows(
+        select(*AIRCRAFT_COLUMNS).where(
+            Aircraft.callsign.ilike(f"%{callsign}%")
+        )
+    )
+
+def find_aircraft_rows_by_icao24(icao24):
+    """
+    Find aircraft by ICAO24 address, returning plain rows
+    
+    Parameters:
+    -----------
+    icao24 : str
+        The ICAO24 address to search for
+        
+    Returns:
+    --------
+    list
+        A list of dicts keyed by the AIRCRAFT_COLUMNS names
+    """
+    return _fetch_rows(
+        select(*AIRCRAFT_COLUMNS).where(
+            Aircraft.icao24.ilike(f"%{icao24}%")
+        )
+    )
+
+def find_aircraft_rows_by_country(country):
+    """
+    Find aircraft by origin country, returning plain rows
+    
+    Parameters:
+    -----------
+    country : str
+        The origin country to search for
+        
+    Returns:
+    --------
+    list
+        A list of dicts keyed by the AIRCRAFT_COLUMNS names
+    """
+    return _fetch_rows(
+        select(*AIRCRAFT_COLUMNS).where(
+            Aircraft.origin_country.ilike(f"%{country}%")
+        )
+    )
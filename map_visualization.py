@@ -2,6 +2,25 @@ import folium
 from folium.plugins import HeatMap
 import numpy as np
 
+# Additional base layers offered in the layer control, as (url, attribution, name)
+TILE_LAYERS = (
+    (
+        'https://stamen-tiles-{s}.a.ssl.fastly.net/terrain/{z}/{x}/{y}.jpg',
+        'Map tiles by <a href="http://stamen.com">Stamen Design</a>, <a href="http://creativecommons.org/licenses/by/3.0">CC BY 3.0</a> &mdash; Map data &copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors',
+        'Stamen Terrain'
+    ),
+    (
+        'https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}{r}.png',
+        '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors &copy; <a href="https://carto.com/attributions">CARTO</a>',
+        'CartoDB Positron'
+    ),
+    (
+        'https://{s}.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}{r}.png',
+        '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors &copy; <a href="https://carto.com/attributions">CARTO</a>',
+        'CartoDB Dark Matter'
+    ),
+)
+
 def create_map(center):
     """
     Create a Folium map centered at the given coordinates.
@@ -24,23 +43,8 @@ def create_map(center):
     )
     
     # Add additional map layers
-    folium.TileLayer(
-        'https://stamen-tiles-{s}.a.ssl.fastly.net/terrain/{z}/{x}/{y}.jpg',
-        attr='Map tiles by <a href="http://stamen.com">Stamen Design</a>, <a href="http://creativecommons.org/licenses/by/3.0">CC BY 3.0</a> &mdash; Map data &copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors',
-        name='Stamen Terrain'
-    ).add_to(m)
-    
-    folium.TileLayer(
-        'https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}{r}.png',
-        attr='&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors &copy; <a href="https://carto.com/attributions">CARTO</a>',
-        name='CartoDB Positron'
-    ).add_to(m)
-    
-    folium.TileLayer(
-        'https://{s}.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}{r}.png',
-        attr='&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors &copy; <a href="https://carto.com/attributions">CARTO</a>',
-        name='CartoDB Dark Matter'
-    ).add_to(m)
+    for url, attr, name in TILE_LAYERS:
+        folium.TileLayer(url, attr=attr, name=name).add_to(m)
     
     # Add layer control
     folium.LayerControl().add_to(m)
@@ -102,15 +106,21 @@ def add_probability_heatmap(m, probability_points):
     -----------
     m : folium.Map
         The map to add the heatmap to
-    probability_points : list
-        List of [lat, lon, probability] points representing the probability distribution
+    probability_points : list or numpy.ndarray
+        [lat, lon, probability] points representing the probability distribution
     """
-    # Extract the data for the heatmap
-    heatmap_data = [[point[0], point[1], point[2] * 1000] for point in probability_points]  # Scale by 1000 for better visibility
+    points = np.asarray(probability_points, dtype=float).reshape(-1, 3)
+    
+    # Extract the data for the heatmap, scaling probabilities by 1000 for better visibility
+    heatmap_data = points.copy()
+    heatmap_data[:, 2] *= 1000
+    
+    # The heatmap and the top-point markers share one layer in the layer control
+    probability_layer = folium.FeatureGroup(name='Probability Distribution')
     
     # Add the heatmap layer
     HeatMap(
-        heatmap_data,
+        heatmap_data.tolist(),
         radius=15,
         max_zoom=13,
         blur=10,
@@ -121,19 +131,38 @@ def add_probability_heatmap(m, probability_points):
             0.8: 'orange',
             1.0: 'red'
         }
-    ).add_to(m)
+    ).add_to(probability_layer)
     
-    # Add markers for the highest probability points (top 5)
-    sorted_points = sorted(probability_points, key=lambda x: x[2], reverse=True)
-    top_points = sorted_points[:5]
+    # Add markers for the highest probability points (top 5); partition out
+    # the five largest, then order only those
+    probabilities = points[:, 2]
+    top_idx = np.argpartition(probabilities, -5)[-5:] if len(points) > 5 else np.arange(len(points))
+    top_points = points[top_idx[np.argsort(-probabilities[top_idx], kind='stable')]]
+    
+    # Draw all the markers from a single GeoJSON layer
+    if len(top_points):
+        top_features = {
+            'type': 'FeatureCollection',
+            'features': [
+                {
+                    'type': 'Feature',
+                    'geometry': {'type': 'Point', 'coordinates': [lon, lat]},  # GeoJSON uses [lon, lat]
+                    'properties': {'description': f"High Probability Area #{i+1}: {probability:.2f}"}
+                }
+                for i, (lat, lon, probability) in enumerate(top_points.tolist())
+            ]
+        }
+        folium.GeoJson(
+            top_features,
+            name='High Probability Areas',
+            marker=folium.CircleMarker(
+                radius=8,
+                color='red',
+                fill=True,
+                fill_color='red',
+                fill_opacity=0.8
+            ),
+            popup=folium.GeoJsonPopup(fields=['description'], labels=False)
+        ).add_to(probability_layer)
     
-    for i, point in enumerate(top_points):
-        folium.CircleMarker(
-            location=[point[0], point[1]],
-            radius=8,
-            color='red',
-            fill=True,
-            fill_color='red',
-            fill_opacity=0.8,
-            popup=f"High Probability Area #{i+1}: {point[2]:.2f}"
-        ).add_to(m)
+    probability_layer.add_to(m)
@@ -1,6 +1,11 @@
+import math
 import numpy as np
 from utils import haversine_distance, get_destination_point
 
+# Shared PCG64 generator for the probability sampler; faster than the legacy
+# global RandomState
+_RNG = np.random.default_rng()
+
 def calculate_search_area(latitude, longitude, altitude, ground_speed, heading, 
                          vertical_speed, wind_speed, wind_direction, aircraft_specs, search_radius_multiplier):
     """
@@ -105,12 +110,12 @@ def calculate_probability_distribution(search_center, search_radius, num_points,
         
     Returns:
     --------
-    list
-        List of [lat, lon, probability] points representing the probability distribution
+    numpy.ndarray
+        Array of shape (num_points, 3) with one [lat, lon, probability] row per point
     """
-    # Convert degrees to radians for calculations
-    heading_rad = np.radians(heading)
-    wind_direction_rad = np.radians(wind_direction)
+    # Convert degrees to radians for calculations (scalars, so plain math avoids ufunc dispatch)
+    heading_rad = math.radians(heading)
+    wind_direction_rad = math.radians(wind_direction)
     
     # Generate random points within the search radius
     # Use a gaussian distribution with higher concentration in the direction of travel and wind
@@ -122,25 +127,25 @@ def calculate_probability_distribution(search_center, search_radius, num_points,
     heading_weight = 1 - wind_weight
     
     # Convert heading and wind direction to x,y components
-    heading_x = np.cos(heading_rad)
-    heading_y = np.sin(heading_rad)
-    wind_x = np.cos(wind_direction_rad)
-    wind_y = np.sin(wind_direction_rad)
+    heading_x = math.cos(heading_rad)
+    heading_y = math.sin(heading_rad)
+    wind_x = math.cos(wind_direction_rad)
+    wind_y = math.sin(wind_direction_rad)
     
     # Calculate the weighted direction
     direction_x = heading_weight * heading_x + wind_weight * wind_x
     direction_y = heading_weight * heading_y + wind_weight * wind_y
     
     # Convert back to angle
-    high_prob_direction = np.arctan2(direction_y, direction_x)
+    high_prob_direction = math.atan2(direction_y, direction_x)
     
     # Generate random distances from center (with bias toward the max probable direction)
-    distances = np.random.rayleigh(scale=search_radius/2, size=num_points)
+    distances = _RNG.rayleigh(scale=search_radius/2, size=num_points)
     distances = np.clip(distances, 0, search_radius)
     
     # Generate random angles with bias toward the high probability direction
     kappa = 2.0  # Concentration parameter (higher = more concentrated)
-    angles = np.random.vonmises(mu=high_prob_direction, kappa=kappa, size=num_points)
+    angles = _RNG.vonmises(mu=high_prob_direction, kappa=kappa, size=num_points)
     
     # Convert polar coordinates to Cartesian
     x = distances * np.cos(angles)
@@ -148,16 +153,17 @@ def calculate_probability_distribution(search_center, search_radius, num_points,
     
     # Calculate probabilities based on distance from center and alignment with high probability direction
     # Points closer to the center and aligned with the high probability direction have higher probability
+    # The sampled distances are non-negative and the von Mises angles lie in [-pi, pi], so they already
+    # are each point's distance from the center and bearing; no need to recover them from x and y
     max_distance = search_radius
-    distance_from_center = np.sqrt(x**2 + y**2)
     
     # Calculate the angle difference between point and high probability direction
-    angle_diff = np.abs(np.arctan2(y, x) - high_prob_direction)
-    angle_diff = np.minimum(angle_diff, 2*np.pi - angle_diff)  # Ensure the difference is the smaller angle
+    angle_diff = np.abs(angles - high_prob_direction)
+    np.minimum(angle_diff, 2*math.pi - angle_diff, out=angle_diff)  # Ensure the difference is the smaller angle
     
     # Calculate probability based on distance and angle
     # Exponential decay with distance from center
-    distance_factor = np.exp(-1.5 * distance_from_center / max_distance)
+    distance_factor = np.exp(-1.5 * distances / max_distance)
     # Cosine factor for angle (1 when aligned with high prob direction, decreasing as angle increases)
     angle_factor = np.cos(angle_diff)**2
     
@@ -165,16 +171,13 @@ def calculate_probability_distribution(search_center, search_radius, num_points,
     probability = distance_factor * (0.7 + 0.3 * angle_factor)
     
     # Normalize probabilities
-    probability = probability / np.max(probability)
+    probability /= probability.max()
     
     # Convert x,y offsets to lat/lon points
     earth_radius_nm = 3440.065  # Earth radius in nautical miles
     lat_points = center_lat + np.degrees(y / earth_radius_nm)
-    lon_points = center_lon + np.degrees(x / (earth_radius_nm * np.cos(np.radians(center_lat))))
-    
-    # Combine into result list
-    results = []
-    for i in range(num_points):
-        results.append([lat_points[i], lon_points[i], float(probability[i])])
+    cos_center_lat = math.cos(math.radians(center_lat))
+    lon_points = center_lon + np.degrees(x / (earth_radius_nm * cos_center_lat))
     
-    return results
+    # Combine into one [lat, lon, probability] row per point
+    return np.column_stack((lat_points, lon_points, probability))
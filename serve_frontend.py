@@ -4,6 +4,29 @@ Utility to serve the Aircraft Tracker frontend
 import streamlit as st
 import streamlit.components.v1 as components
 import os
+import re
+
+# Relative resource directories referenced by the HTML interfaces, keyed by attribute
+HTML_RESOURCE_DIRS = {'src': 'js', 'href': 'css'}
+
+# Matches every rewritable attribute in one pass, stopping just before the directory name
+HTML_RESOURCE_PATTERN = re.compile('|'.join(
+    f'{attribute}="(?={resource_dir}/)' for attribute, resource_dir in HTML_RESOURCE_DIRS.items()
+))
+
+@st.cache_data
+def load_html_interface(file_path, mtime):
+    """
+    Load an HTML interface and point its relative resource paths at its own directory.
+    The file's modification time is part of the cache key so edits are picked up.
+    """
+    base_dir = os.path.dirname(file_path)
+    with open(file_path, 'r') as f:
+        html_content = f.read()
+    
+    # Inject base path for resources
+    prefix = f'{base_dir}/'
+    return HTML_RESOURCE_PATTERN.sub(lambda match: match.group(0) + prefix, html_content)
 
 def serve_tracker_frontend():
     """
@@ -47,12 +70,7 @@ def serve_html_file(file_path):
         return
         
     try:
-        with open(file_path, 'r') as f:
-            html_content = f.read()
-            
-        # Replace relative paths for resources
-        html_content = html_content.replace('src="js/', f'src="aircraft-tracker/js/')
-        html_content = html_content.replace('href="css/', f'href="aircraft-tracker/css/')
+        html_content = load_html_interface(file_path, os.path.getmtime(file_path))
             
         # Display the HTML content
         components.html(html_content, height=1000, width=1000, scrolling=False)
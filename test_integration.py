@@ -2,16 +2,24 @@
 Integration test script for HTML frontend and Database API communication
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import webbrowser
 import os
 import time
-from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
 
 def test_database_api():
     """Test communication with the database API"""
     base_url = "http://localhost:5001"
     
+    # Endpoint URLs, built once
+    aircraft_url, positions_url, search_url = (
+        base_url + path for path in ('/api/aircraft', '/api/positions', '/api/search')
+    )
+    icao24_search_url = base_url + '/api/aircraft/search/icao24/{}'
+    
     # Test aircraft endpoint
     test_aircraft = {
         "icao24": "test123",
@@ -20,11 +28,18 @@ def test_database_api():
         "origin_country": "Testland"
     }
     
+    # One session for every call, so the keep-alive connection is reused
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(
+        pool_connections=4, pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.1)
+    ))
+    
     try:
         # Test adding an aircraft
         print("Testing aircraft API...")
-        response = requests.post(
-            urljoin(base_url, '/api/aircraft'),
+        response = session.post(
+            aircraft_url,
             json=test_aircraft
         )
         
@@ -47,8 +62,8 @@ def test_database_api():
                     "on_ground": False
                 }
                 
-                response = requests.post(
-                    urljoin(base_url, '/api/positions'),
+                response = session.post(
+                    positions_url,
                     json=position_data
                 )
                 
@@ -58,36 +73,43 @@ def test_database_api():
                 else:
                     print(f"✗ Failed to add position: {response.text}")
             
-            # Test search functionality
-            print("\nTesting search API...")
+            # The search and the ICAO24 lookup are independent, so send them concurrently
             search_data = {
                 "search_type": "icao24",
                 "search_value": "test123",
                 "aircraft_ids": [aircraft_id] if aircraft_id else []
             }
             
-            response = requests.post(
-                urljoin(base_url, '/api/search'),
-                json=search_data
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                print(f"✓ Successfully saved search: {result}")
-            else:
-                print(f"✗ Failed to save search: {response.text}")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                search_future = executor.submit(
+                    session.post,
+                    search_url,
+                    json=search_data
+                )
+                icao24_future = executor.submit(
+                    session.get,
+                    icao24_search_url.format(test_aircraft["icao24"])
+                )
                 
-            # Test search by ICAO24
-            print("\nTesting search by ICAO24...")
-            response = requests.get(
-                urljoin(base_url, f'/api/aircraft/search/icao24/{test_aircraft["icao24"]}')
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                print(f"✓ Successfully searched by ICAO24: {result}")
-            else:
-                print(f"✗ Failed to search by ICAO24: {response.text}")
+                # Test search functionality
+                print("\nTesting search API...")
+                response = search_future.result()
+                
+                if response.status_code == 200:
+                    result = response.json()
+                    print(f"✓ Successfully saved search: {result}")
+                else:
+                    print(f"✗ Failed to save search: {response.text}")
+                    
+                # Test search by ICAO24
+                print("\nTesting search by ICAO24...")
+                response = icao24_future.result()
+                
+                if response.status_code == 200:
+                    result = response.json()
+                    print(f"✓ Successfully searched by ICAO24: {result}")
+                else:
+                    print(f"✗ Failed to search by ICAO24: {response.text}")
                 
         else:
             print(f"✗ Failed to add aircraft: {response.text}")
@@ -99,6 +121,8 @@ def test_database_api():
     except Exception as e:
         print(f"✗ Unexpected error: {str(e)}")
         return False
+    finally:
+        session.close()
         
     print("\n✓ API tests completed successfully!")
     return True
@@ -2,8 +2,8 @@ import streamlit as st
 from streamlit.web.server.server import Server
 import threading
 import http.server
-import socketserver
 import os
+import functools
 import time
 from streamlit.runtime.scriptrunner import get_script_run_ctx
 import webbrowser
@@ -16,21 +16,45 @@ STATIC_DIR = "static"
 
 def serve_html_frontend():
     # Create a simple server to serve static HTML/JS/CSS files
-    os.chdir(STATIC_DIR)
     
     # Create the handler
     class CORSHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+        # Validator of the file being served, set by send_head
+        etag = None
+        
+        def send_head(self):
+            path = self.translate_path(self.path)
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                self.etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+                self.is_html = path.endswith('.html')
+                
+                # The browser's cached copy is current; answer without a body
+                if_none_match = self.headers.get('If-None-Match', '')
+                if self.etag in (tag.strip() for tag in if_none_match.split(',')):
+                    self.send_response(http.HTTPStatus.NOT_MODIFIED)
+                    self.end_headers()
+                    return None
+            return super(CORSHTTPRequestHandler, self).send_head()
+        
         def end_headers(self):
             self.send_header('Access-Control-Allow-Origin', '*')
             self.send_header('Access-Control-Allow-Methods', 'GET')
-            self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
+            if self.etag is None:
+                self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
+            else:
+                # Pages revalidate on every load; assets may be reused for a minute
+                self.send_header('ETag', self.etag)
+                self.send_header('Cache-Control', 'no-cache' if self.is_html else 'public, max-age=60, must-revalidate')
             return super(CORSHTTPRequestHandler, self).end_headers()
     
     # Use a high port for the internal server
     PORT = 8099
-    Handler = CORSHTTPRequestHandler
+    # Serve from STATIC_DIR by absolute path rather than changing the process cwd
+    Handler = functools.partial(CORSHTTPRequestHandler, directory=os.path.abspath(STATIC_DIR))
     
-    with socketserver.TCPServer(("", PORT), Handler) as httpd:
+    # One thread per connection, so parallel asset loads don't queue behind each other
+    with http.server.ThreadingHTTPServer(("", PORT), Handler) as httpd:
         print(f"HTML frontend server started at http://localhost:{PORT}")
         httpd.serve_forever()
 
@@ -1,40 +1,90 @@
 import numpy as np
 import math
-import json
+import orjson
 import io
-import csv
+from functools import lru_cache
+
+# Inputs that send haversine_distance down the vectorized path
+_ARRAY_TYPES = (list, tuple, np.ndarray)
 
 def haversine_distance(lat1, lon1, lat2, lon2):
     """
     Calculate the great circle distance between two points 
     on the earth (specified in decimal degrees).
     
+    Scalars use the math module, which is faster than NumPy for single
+    values; array-like inputs are handed to haversine_vector.
+    
     Parameters:
     -----------
-    lat1, lon1 : float
+    lat1, lon1 : float or array-like
         Latitude and longitude of point 1 in decimal degrees
-    lat2, lon2 : float
+    lat2, lon2 : float or array-like
         Latitude and longitude of point 2 in decimal degrees
         
     Returns:
     --------
-    float
+    float or numpy.ndarray
         Distance between the points in nautical miles
     """
+    if (isinstance(lat1, _ARRAY_TYPES) or isinstance(lon1, _ARRAY_TYPES)
+            or isinstance(lat2, _ARRAY_TYPES) or isinstance(lon2, _ARRAY_TYPES)):
+        return haversine_vector(lat1, lon1, lat2, lon2)
+    
     # Convert decimal degrees to radians
     lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
     
-    # Haversine formula
+    # Vincenty formula for a sphere: atan2 of the cross and dot products of
+    # the two position vectors, which stays accurate for very short and for
+    # near-antipodal distances where asin(sqrt(a)) loses precision
     dlon = lon2 - lon1
-    dlat = lat2 - lat1
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-    c = 2 * math.asin(math.sqrt(a))
+    sin_lat1, cos_lat1 = math.sin(lat1), math.cos(lat1)
+    sin_lat2, cos_lat2 = math.sin(lat2), math.cos(lat2)
+    sin_dlon, cos_dlon = math.sin(dlon), math.cos(dlon)
+    cross = math.hypot(cos_lat2 * sin_dlon, cos_lat1 * sin_lat2 - sin_lat1 * cos_lat2 * cos_dlon)
+    dot = sin_lat1 * sin_lat2 + cos_lat1 * cos_lat2 * cos_dlon
+    c = math.atan2(cross, dot)
     
     # Radius of earth in nautical miles
     r = 3440.065
     
     return c * r
 
+def haversine_vector(lats1, lons1, lats2, lons2):
+    """
+    Calculate great circle distances between arrays of points, broadcasting
+    the inputs against each other (e.g. one point against many).
+    
+    Parameters:
+    -----------
+    lats1, lons1 : array-like
+        Latitudes and longitudes of the first points in decimal degrees
+    lats2, lons2 : array-like
+        Latitudes and longitudes of the second points in decimal degrees
+        
+    Returns:
+    --------
+    numpy.ndarray
+        Distances between the points in nautical miles
+    """
+    # Convert decimal degrees to radians
+    to_radians = np.pi / 180.0
+    lat1 = np.asarray(lats1, dtype=float) * to_radians
+    lon1 = np.asarray(lons1, dtype=float) * to_radians
+    lat2 = np.asarray(lats2, dtype=float) * to_radians
+    lon2 = np.asarray(lons2, dtype=float) * to_radians
+    
+    # Vincenty formula for a sphere, as in haversine_distance
+    dlon = lon2 - lon1
+    sin_lat1, cos_lat1 = np.sin(lat1), np.cos(lat1)
+    sin_lat2, cos_lat2 = np.sin(lat2), np.cos(lat2)
+    sin_dlon, cos_dlon = np.sin(dlon), np.cos(dlon)
+    cross = np.hypot(cos_lat2 * sin_dlon, cos_lat1 * sin_lat2 - sin_lat1 * cos_lat2 * cos_dlon)
+    dot = sin_lat1 * sin_lat2 + cos_lat1 * cos_lat2 * cos_dlon
+    
+    # Radius of earth in nautical miles
+    return 3440.065 * np.arctan2(cross, dot)
+
 def calculate_bearing(lat1, lon1, lat2, lon2):
     """
     Calculate the bearing between two points.
@@ -95,12 +145,17 @@ def get_destination_point(lat, lon, bearing, distance):
     # Earth radius in nautical miles
     earth_radius = 3440.065
     
+    # Angular distance and the sines/cosines shared by both formulas, computed once
+    angular_distance = distance / earth_radius
+    sin_lat, cos_lat = math.sin(lat), math.cos(lat)
+    sin_dist, cos_dist = math.sin(angular_distance), math.cos(angular_distance)
+    
     # Calculate destination point
-    lat2 = math.asin(math.sin(lat) * math.cos(distance/earth_radius) + 
-                     math.cos(lat) * math.sin(distance/earth_radius) * math.cos(bearing))
+    sin_lat2 = sin_lat * cos_dist + cos_lat * sin_dist * math.cos(bearing)
+    lat2 = math.asin(sin_lat2)
     
-    lon2 = lon + math.atan2(math.sin(bearing) * math.sin(distance/earth_radius) * math.cos(lat),
-                           math.cos(distance/earth_radius) - math.sin(lat) * math.sin(lat2))
+    lon2 = lon + math.atan2(math.sin(bearing) * sin_dist * cos_lat,
+                           cos_dist - sin_lat * sin_lat2)
     
     # Convert back to degrees
     lat2 = math.degrees(lat2)
@@ -108,7 +163,67 @@ def get_destination_point(lat, lon, bearing, distance):
     
     return lat2, lon2
 
-def export_search_coordinates(search_center, search_radius, probability_points, export_format):
+def get_destination_points(lat, lon, bearings, distance):
+    """
+    Calculate the destination points reached from one starting point along
+    several bearings, all at the same distance.
+    
+    Parameters:
+    -----------
+    lat, lon : float
+        Latitude and longitude of starting point in decimal degrees
+    bearings : array-like
+        Bearing angles in degrees
+    distance : float
+        Distance to travel in nautical miles
+        
+    Returns:
+    --------
+    tuple
+        (lats, lons) arrays of the destination points in decimal degrees
+    """
+    # Convert decimal degrees to radians
+    lat = math.radians(lat)
+    lon = math.radians(lon)
+    bearings = np.radians(np.asarray(bearings, dtype=float))
+    
+    # Earth radius in nautical miles
+    earth_radius = 3440.065
+    
+    # The start point and distance are shared by every bearing, so their
+    # sines and cosines are computed once
+    angular_distance = distance / earth_radius
+    sin_lat, cos_lat = math.sin(lat), math.cos(lat)
+    sin_dist, cos_dist = math.sin(angular_distance), math.cos(angular_distance)
+    
+    # Calculate destination points
+    sin_lat2 = sin_lat * cos_dist + cos_lat * sin_dist * np.cos(bearings)
+    lat2 = np.arcsin(sin_lat2)
+    
+    lon2 = lon + np.arctan2(np.sin(bearings) * sin_dist * cos_lat,
+                            cos_dist - sin_lat * sin_lat2)
+    
+    # Convert back to degrees
+    return np.degrees(lat2), np.degrees(lon2)
+
+@lru_cache(maxsize=128)
+def _boundary_points(lat0, lon0, radius_nm, n=36):
+    """
+    Return n (lat, lon) pairs evenly spaced around the search area boundary,
+    starting due north. Cached, so exporting the same search area in
+    several formats computes the ring once.
+    """
+    lats, lons = get_destination_points(lat0, lon0, np.arange(n) * (360.0 / n), radius_nm)
+    return tuple(zip(lats.tolist(), lons.tolist()))
+
+def _points_above(probability_points, threshold):
+    """[lat, lon, probability] rows whose probability exceeds threshold"""
+    if isinstance(probability_points, np.ndarray):
+        # One vectorized comparison over the probability column
+        return probability_points[probability_points[:, 2] > threshold].tolist()
+    return [p for p in probability_points if p[2] > threshold]
+
+def export_search_coordinates(search_center, search_radius, probability_points, export_format, out=None):
     """
     Export search area coordinates in the specified format.
     
@@ -118,40 +233,42 @@ def export_search_coordinates(search_center, search_radius, probability_points,
         (latitude, longitude) of the search center
     search_radius : float
         Radius of the search area in nautical miles
-    probability_points : list
-        List of [lat, lon, probability] points representing the probability distribution
+    probability_points : list or numpy.ndarray
+        [lat, lon, probability] points representing the probability distribution
     export_format : str
         Format to export the data in ('CSV' or 'GeoJSON')
+    out : file-like, optional
+        Text stream to write the export to instead of building a string
         
     Returns:
     --------
-    str
-        String containing the exported data in the specified format
+    str or None
+        String containing the exported data in the specified format, or None
+        when it was written to out
     """
     if export_format == "CSV":
-        output = io.StringIO()
-        writer = csv.writer(output)
+        output = io.StringIO() if out is None else out
+        
+        # Every field is a number or a fixed label, so no quoting is needed
+        # and rows are formatted directly instead of through csv.writer
         
         # Write header
-        writer.writerow(["Latitude", "Longitude", "Probability", "Type"])
+        output.write("Latitude,Longitude,Probability,Type\n")
         
         # Write search center
-        writer.writerow([search_center[0], search_center[1], 1.0, "center"])
+        output.write(f"{search_center[0]:.6f},{search_center[1]:.6f},1.0000,center\n")
         
         # Write search area boundary points
-        num_boundary_points = 36  # One point every 10 degrees
-        for i in range(num_boundary_points):
-            angle = math.radians(i * 10)
-            lat, lon = get_destination_point(search_center[0], search_center[1], 
-                                           math.degrees(angle), search_radius)
-            writer.writerow([lat, lon, 0.0, "boundary"])
+        boundary = _boundary_points(search_center[0], search_center[1], search_radius)  # One point every 10 degrees
+        output.writelines(f"{lat:.6f},{lon:.6f},0.0000,boundary\n" for lat, lon in boundary)
         
         # Write probability points (only include points with probability > 0.2 to keep file size reasonable)
-        significant_points = [p for p in probability_points if p[2] > 0.2]
-        for point in significant_points:
-            writer.writerow([point[0], point[1], point[2], "probability"])
+        output.writelines(
+            f"{p[0]:.6f},{p[1]:.6f},{p[2]:.4f},probability\n"
+            for p in _points_above(probability_points, 0.2)
+        )
         
-        return output.getvalue()
+        return output.getvalue() if out is None else None
     
     else:  # GeoJSON
         features = []
@@ -171,13 +288,9 @@ def export_search_coordinates(search_center, search_radius, probability_points,
         })
         
         # Add search area boundary
-        boundary_coords = []
-        num_boundary_points = 36  # One point every 10 degrees
-        for i in range(num_boundary_points + 1):  # +1 to close the loop
-            angle = math.radians(i % 36 * 10)
-            lat, lon = get_destination_point(search_center[0], search_center[1], 
-                                           math.degrees(angle), search_radius)
-            boundary_coords.append([lon, lat])  # GeoJSON uses [lon, lat]
+        boundary = _boundary_points(search_center[0], search_center[1], search_radius)  # One point every 10 degrees
+        boundary_coords = [[lon, lat] for lat, lon in boundary]  # GeoJSON uses [lon, lat]
+        boundary_coords.append(boundary_coords[0])  # Repeat the first point to close the loop
         
         features.append({
             "type": "Feature",
@@ -191,19 +304,21 @@ def export_search_coordinates(search_center, search_radius, probability_points,
             }
         })
         
-        # Add high probability points (only include points with probability > 0.5)
-        high_prob_points = [p for p in probability_points if p[2] > 0.5]
-        for point in high_prob_points:
+        # Add high probability points (only include points with probability > 0.5) as a
+        # single MultiPoint; properties.probabilities runs parallel to its coordinates
+        points = np.asarray(probability_points, dtype=float).reshape(-1, 3)
+        high_prob_points = points[points[:, 2] > 0.5]
+        if len(high_prob_points):
             features.append({
                 "type": "Feature",
                 "geometry": {
-                    "type": "Point",
-                    "coordinates": [point[1], point[0]]  # GeoJSON uses [lon, lat]
+                    "type": "MultiPoint",
+                    "coordinates": high_prob_points[:, [1, 0]].tolist()  # GeoJSON uses [lon, lat]
                 },
                 "properties": {
                     "type": "probability",
-                    "probability": point[2],
-                    "description": f"Probability: {point[2]:.2f}"
+                    "probabilities": high_prob_points[:, 2].tolist(),
+                    "description": f"{len(high_prob_points)} points with probability > 0.50"
                 }
             })
         
@@ -213,4 +328,9 @@ def export_search_coordinates(search_center, search_radius, probability_points,
             "features": features
         }
         
-        return json.dumps(geojson, indent=2)
+        # orjson encodes the feature list in C; it returns bytes
+        text = orjson.dumps(geojson, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
+        if out is not None:
+            out.write(text)
+            return None
+        return text